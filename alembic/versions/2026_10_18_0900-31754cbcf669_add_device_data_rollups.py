@@ -0,0 +1,58 @@
+"""add device data rollups
+
+Revision ID: 31754cbcf669
+Revises: 1b37c2542f97
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '31754cbcf669'
+down_revision = '1b37c2542f97'
+branch_labels = None
+depends_on = None
+
+# Bucket width per resolution, as accepted by date_trunc.
+RESOLUTIONS = {'1m': 'minute', '1h': 'hour', '1d': 'day'}
+
+
+def upgrade():
+    op.create_table('device_data_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('device_id', sa.Integer(), nullable=False),
+    sa.Column('data_type', sa.String(length=100), nullable=False),
+    sa.Column('resolution', sa.String(length=8), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('sum', sa.Float(), nullable=False),
+    sa.Column('min', sa.Float(), nullable=False),
+    sa.Column('max', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['device_id'], ['wearable_devices.id'], name=op.f('fk_device_data_rollups_device_id_wearable_devices')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_device_data_rollups')),
+    sa.UniqueConstraint('device_id', 'data_type', 'resolution', 'bucket_start', name='uq_device_data_rollups_bucket')
+    )
+    op.create_index(op.f('ix_device_data_rollups_id'), 'device_data_rollups', ['id'], unique=False)
+
+    # Backfill from readings ingested before rollups were maintained.
+    for resolution, unit in RESOLUTIONS.items():
+        op.execute(
+            f"""
+            INSERT INTO device_data_rollups
+                (device_id, data_type, resolution, bucket_start, count, sum, min, max)
+            SELECT device_id, data_type, '{resolution}',
+                   date_trunc('{unit}', recorded_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                   count(value), sum(value), min(value), max(value)
+            FROM device_data
+            WHERE value IS NOT NULL
+            GROUP BY device_id, data_type,
+                     date_trunc('{unit}', recorded_at AT TIME ZONE 'UTC')
+            """
+        )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_device_data_rollups_id'), table_name='device_data_rollups')
+    op.drop_table('device_data_rollups')
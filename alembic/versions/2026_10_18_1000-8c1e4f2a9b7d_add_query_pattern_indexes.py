@@ -0,0 +1,48 @@
+"""add query pattern indexes
+
+Revision ID: 8c1e4f2a9b7d
+Revises: 31754cbcf669
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1e4f2a9b7d'
+down_revision = '31754cbcf669'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns): the leading column is the equality filter the API
+# runs, the second the range/sort column that usually comes with it.
+INDEXES = [
+    ('ix_appointments_patient_id_appointment_datetime', 'appointments', ['patient_id', 'appointment_datetime']),
+    ('ix_appointments_doctor_id_appointment_datetime', 'appointments', ['doctor_id', 'appointment_datetime']),
+    ('ix_medical_records_patient_id_visit_date', 'medical_records', ['patient_id', 'visit_date']),
+    ('ix_medical_records_doctor_id_visit_date', 'medical_records', ['doctor_id', 'visit_date']),
+    ('ix_insurance_claims_patient_id_status', 'insurance_claims', ['patient_id', 'status']),
+    ('ix_lab_orders_patient_id_order_date', 'lab_orders', ['patient_id', 'order_date']),
+    ('ix_device_data_device_id_recorded_at', 'device_data', ['device_id', 'recorded_at']),
+    ('ix_notifications_user_id_is_read', 'notifications', ['user_id', 'is_read']),
+]
+
+
+def upgrade():
+    # Built concurrently so large tables (device_data, appointments) keep
+    # taking writes; CREATE INDEX CONCURRENTLY cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
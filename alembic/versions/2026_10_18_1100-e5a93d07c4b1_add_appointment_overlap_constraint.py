@@ -0,0 +1,80 @@
+"""add appointment overlap constraint
+
+Revision ID: e5a93d07c4b1
+Revises: 8c1e4f2a9b7d
+Create Date: 2026-10-18 11:00:00.000000
+
+The constraint cannot be added while a doctor already has overlapping active
+appointments, so the upgrade first looks for them and stops, listing every
+conflicting pair, if there are any. Cancel or reschedule those appointments
+(which one to move is a scheduling decision, not a migration's) and rerun it.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a93d07c4b1'
+down_revision = '8c1e4f2a9b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The API checks for overlaps before writing; this constraint closes the
+    # race between two concurrent bookings of the same doctor. Adding minutes
+    # to a timestamptz does not depend on the session time zone, so the
+    # wrapper can safely be declared IMMUTABLE for use in the index.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        CREATE FUNCTION appointment_period(starts_at timestamptz, minutes integer)
+        RETURNS tstzrange
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT tstzrange(starts_at, starts_at + make_interval(mins => coalesce(minutes, 30))) $$
+        """
+    )
+    conflicts = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT a.doctor_id, a.id, a.appointment_datetime, b.id, b.appointment_datetime
+            FROM appointments a
+            JOIN appointments b
+              ON b.doctor_id = a.doctor_id
+             AND b.id > a.id
+             AND appointment_period(b.appointment_datetime, b.duration_minutes)
+                 && appointment_period(a.appointment_datetime, a.duration_minutes)
+            WHERE a.status NOT IN ('CANCELLED', 'NO_SHOW')
+              AND b.status NOT IN ('CANCELLED', 'NO_SHOW')
+            ORDER BY a.doctor_id, a.appointment_datetime
+            """
+        )
+    ).all()
+    if conflicts:
+        pairs = "\n".join(
+            f"  doctor {doctor_id}: appointment {first_id} at {first_at}"
+            f" overlaps appointment {second_id} at {second_at}"
+            for doctor_id, first_id, first_at, second_id, second_at in conflicts
+        )
+        raise RuntimeError(
+            f"{len(conflicts)} pair(s) of active appointments overlap; cancel or "
+            f"reschedule one of each pair, then rerun the upgrade:\n{pairs}"
+        )
+
+    op.execute(
+        """
+        ALTER TABLE appointments
+        ADD CONSTRAINT ex_appointments_doctor_period
+        EXCLUDE USING gist (
+            doctor_id WITH =,
+            appointment_period(appointment_datetime, duration_minutes) WITH &&
+        )
+        WHERE (status NOT IN ('CANCELLED', 'NO_SHOW'))
+        """
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE appointments DROP CONSTRAINT ex_appointments_doctor_period")
+    op.execute("DROP FUNCTION appointment_period(timestamptz, integer)")
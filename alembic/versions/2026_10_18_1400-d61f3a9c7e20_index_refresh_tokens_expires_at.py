@@ -0,0 +1,23 @@
+"""index refresh_tokens.expires_at
+
+Revision ID: d61f3a9c7e20
+Revises: b83c5e1f0d27
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd61f3a9c7e20'
+down_revision = 'b83c5e1f0d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
@@ -0,0 +1,33 @@
+"""add import checkpoints
+
+Revision ID: 7a2e9c4d1f58
+Revises: d61f3a9c7e20
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2e9c4d1f58'
+down_revision = 'd61f3a9c7e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_checkpoints',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('source', sa.String(length=1024), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('imported', sa.Integer(), nullable=False),
+    sa.Column('rejected', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name', name=op.f('pk_import_checkpoints'))
+    )
+
+
+def downgrade():
+    op.drop_table('import_checkpoints')
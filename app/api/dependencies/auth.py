@@ -3,7 +3,10 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api.dependencies.database import get_async_session
-from app.auth.jwt_handler import verify_token
+from app.auth.jwt_handler import decode_token
+from app.auth.principal_cache import cache_principal, get_cached_principal
+from app.auth.stateless import is_stateless, principal_from_claims
+from app.core.config import settings
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -18,16 +21,31 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    username = verify_token(token)
-    if username is None:
+    claims = decode_token(token)
+    if claims is None or claims.get("sub") is None:
         raise credentials_exception
 
+    if is_stateless(claims):
+        # Tokens minted while stateless mode was on are honoured only while
+        # it still is, so switching it off falls back to database checks.
+        user = principal_from_claims(claims) if settings.stateless_auth else None
+        if user is None:
+            raise credentials_exception
+        return user
+
+    username = claims["sub"]
+
+    user = get_cached_principal(username)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    cache_principal(user)
     return user
 
 
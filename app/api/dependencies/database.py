@@ -1,3 +1,3 @@
-from app.database.session import get_async_session
+from app.database.session import get_async_session, get_read_session
 
-__all__ = ["get_async_session"]
+__all__ = ["get_async_session", "get_read_session"]
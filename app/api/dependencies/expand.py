@@ -0,0 +1,46 @@
+from typing import Optional
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload
+
+
+class Expand:
+    """``?expand=patient,doctor`` for resources with optional nested relationships.
+
+    Relationships are only loaded when asked for, with a joined load so the
+    read stays a single query. ``render`` builds the expanded response schema
+    with just the requested relationships set; routes use
+    ``response_model_exclude_unset=True`` so unexpanded ones are omitted.
+    """
+
+    def __init__(
+        self,
+        expand: Optional[str] = Query(
+            None, description="Comma-separated relationships to embed, e.g. patient,doctor"
+        ),
+    ):
+        self.names = frozenset()
+        if expand is not None:
+            self.names = frozenset(name.strip() for name in expand.split(",") if name.strip())
+
+    def options(self, model, schema: type[BaseModel]) -> list:
+        relationships = inspect(model).relationships
+        unknown = {
+            name
+            for name in self.names
+            if name not in schema.model_fields or name not in relationships
+        }
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot expand: {', '.join(sorted(unknown))}",
+            )
+        return [joinedload(getattr(model, name)) for name in sorted(self.names)]
+
+    def render(self, obj, schema: type[BaseModel], base: type[BaseModel]) -> BaseModel:
+        # Read only the base columns plus what was expanded; touching an
+        # unloaded relationship would trigger a lazy load.
+        data = {name: getattr(obj, name) for name in base.model_fields}
+        data.update((name, getattr(obj, name)) for name in self.names)
+        return schema.model_validate(data, from_attributes=True)
@@ -0,0 +1,85 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Literal
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_RESPONSES = {
+    200: {
+        "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        "description": "Every matching row, streamed in id order",
+    }
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _encode_ndjson(keys: list[str], rows) -> bytes:
+    return "".join(
+        json.dumps(
+            {key: _plain(value) for key, value in zip(keys, row)},
+            separators=(",", ":"),
+        )
+        + "\n"
+        for row in rows
+    ).encode()
+
+
+def _encode_csv(keys: list[str], rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+class Export:
+    """Streams every row of a query as NDJSON or CSV in constant memory.
+
+    Rows are read through a server-side cursor in batches of
+    ``settings.export_chunk_size`` and written out as each batch arrives, so
+    neither the database driver nor the app ever holds the full result.
+    """
+
+    def __init__(self, format: Literal["ndjson", "csv"] = Query("ndjson")):
+        self.format = format
+
+    async def _chunks(self, db: AsyncSession, query, keys: list[str]) -> AsyncIterator[bytes]:
+        encode = _encode_csv if self.format == "csv" else _encode_ndjson
+        if self.format == "csv":
+            yield _encode_csv(keys, [keys])
+        # The request's session may be closed before the body is sent, so the
+        # stream holds its own connection on the same engine.
+        async with db.bind.connect() as conn:
+            result = await conn.stream(
+                query.execution_options(yield_per=settings.export_chunk_size)
+            )
+            async for rows in result.partitions():
+                yield encode(keys, rows)
+
+    def stream(
+        self, db: AsyncSession, query, model, schema: type[BaseModel], *, filename: str
+    ) -> StreamingResponse:
+        """Export the ``schema`` fields of every ``model`` row ``query`` selects."""
+        keys = list(schema.model_fields)
+        columns = [model.__table__.c[key] for key in keys]
+        query = query.with_only_columns(*columns).order_by(model.id)
+        return StreamingResponse(
+            self._chunks(db, query, keys),
+            media_type=MEDIA_TYPES[self.format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.{self.format}"'
+            },
+        )
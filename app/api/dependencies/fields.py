@@ -0,0 +1,40 @@
+from typing import Optional
+from fastapi import HTTPException, Query, status
+from app.utils.serialization import RowSerializer
+
+
+class SparseFields:
+    """``?fields=`` sparse fieldsets for list endpoints.
+
+    Narrows both the SELECT and the JSON payload to the requested fields of
+    the response schema; ``id`` is always included. Omitting the parameter
+    returns every field.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated response fields to return, e.g. id,visit_date"
+        ),
+    ):
+        self.names = None
+        if fields is not None:
+            self.names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+
+    def apply(self, serializer: RowSerializer) -> RowSerializer:
+        if self.names is None:
+            return serializer
+        unknown = self.names.difference(serializer.fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        return serializer.only(self.names)
+
+    def forbid_with_expand(self) -> None:
+        if self.names is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="fields cannot be combined with expand",
+            )
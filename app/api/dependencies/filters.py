@@ -0,0 +1,65 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Sequence
+from fastapi import HTTPException, Query, status
+from sqlalchemy import DateTime, or_
+
+
+class ListFilters:
+    """Common server-side filters for collection endpoints.
+
+    Each route tells ``apply`` which columns back the doctor and date filters;
+    asking for a filter the resource has no column for is a 400.
+    """
+
+    def __init__(
+        self,
+        patient_id: Optional[int] = None,
+        doctor_id: Optional[int] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = Query(None, description="Inclusive lower bound"),
+        date_to: Optional[date] = Query(None, description="Inclusive upper bound"),
+    ):
+        self.patient_id = patient_id
+        self.doctor_id = doctor_id
+        self.status = status
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def apply(self, query, model, *, date_column=None, doctor_columns: Sequence = ()):
+        if self.patient_id is not None:
+            query = query.where(self._column(model, "patient_id") == self.patient_id)
+        if self.doctor_id is not None:
+            columns = doctor_columns or [self._column(model, "doctor_id")]
+            query = query.where(or_(*(column == self.doctor_id for column in columns)))
+        if self.status is not None:
+            query = query.where(self._column(model, "status") == self.status)
+        if self.date_from is not None or self.date_to is not None:
+            if date_column is None:
+                self._unsupported("date_from/date_to")
+            if self.date_from is not None:
+                query = query.where(
+                    date_column >= self._bound(date_column, self.date_from)
+                )
+            if self.date_to is not None:
+                upper = self.date_to + timedelta(days=1)
+                query = query.where(date_column < self._bound(date_column, upper))
+        return query
+
+    @staticmethod
+    def _bound(column, value: date):
+        if isinstance(column.type, DateTime):
+            return datetime.combine(value, time.min)
+        return value
+
+    def _column(self, model, name: str):
+        column = getattr(model, name, None)
+        if column is None:
+            self._unsupported(name)
+        return column
+
+    @staticmethod
+    def _unsupported(name: str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Filter '{name}' is not supported for this resource",
+        )
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+from fastapi import HTTPException, Query, Response, status
+from app.core.config import settings
+from app.utils.serialization import RowSerializer
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        last_id = None
+    if not isinstance(last_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return last_id
+
+
+class Pagination:
+    """Offset or keyset pagination shared by the list endpoints.
+
+    Results are always ordered by primary key. Passing ``after`` switches to
+    keyset mode, which seeks past the last seen id instead of scanning and
+    discarding ``skip`` rows. Whenever a page is full, the cursor for the
+    following page is returned in the ``X-Next-Cursor`` response header.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=settings.max_page_size),
+        after: Optional[str] = Query(
+            None, description="Opaque cursor from a previous X-Next-Cursor header"
+        ),
+    ):
+        self.response = response
+        self.skip = skip
+        self.limit = limit
+        self.after = decode_cursor(after) if after is not None else None
+
+    def apply(self, query, model):
+        query = query.order_by(model.id)
+        if self.after is not None:
+            query = query.where(model.id > self.after)
+        else:
+            query = query.offset(self.skip)
+        return query.limit(self.limit)
+
+    def paginate(self, rows: Sequence) -> Sequence:
+        self._set_next_cursor(self.response, rows)
+        return rows
+
+    def render(self, rows: Sequence, serializer: RowSerializer) -> Response:
+        """Paginate column rows and serialize them directly, bypassing response_model.
+
+        The rendered response replaces the injected one, so the cursor header
+        is set on it instead.
+        """
+        response = serializer.render(rows)
+        self._set_next_cursor(response, rows)
+        return response
+
+    def _set_next_cursor(self, response: Response, rows: Sequence) -> None:
+        if len(rows) == self.limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
@@ -1,22 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
-from app.api.dependencies.database import get_async_session
+from sqlalchemy import exists, select
+from typing import Any, List, Mapping
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.expand import Expand
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.pagination import Pagination
+from app.core.config import settings
+from app.database.availability import (
+    find_batch_conflicts,
+    find_conflict,
+    is_overlap_violation,
+    longest_booking,
+    overlapping,
+    stays_free,
+)
+from app.database.crud import (
+    bulk_create,
+    create_with_parents,
+    delete_object,
+    delete_objects,
+    find_missing_parent,
+    update_object,
+)
+from app.schemas.bulk import BulkCreateResponse, BulkDeleteRequest, BulkDeleteResponse
 from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentUpdate,
+    AppointmentStatusUpdate,
     AppointmentResponse,
+    AppointmentExpandedResponse,
 )
 from app.models.appointment import Appointment
 from app.models.patient import Patient
 from app.models.doctor import Doctor
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
+appointment_rows = RowSerializer(Appointment, AppointmentResponse)
+
+
+def _double_booking(conflict=None) -> HTTPException:
+    detail = "Doctor is already booked at that time"
+    if conflict is not None:
+        detail = f"Doctor is already booked by appointment {conflict}"
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+@asynccontextmanager
+async def _booking(db: AsyncSession):
+    """Turn the database's overlap constraint firing under a race into a 409."""
+    try:
+        yield
+    except IntegrityError as error:
+        await db.rollback()
+        if not is_overlap_violation(error):
+            raise
+        raise _double_booking()
+
+
+async def _update_booking(
+    db: AsyncSession, appointment_id: int, changes: Mapping[str, Any]
+) -> Appointment:
+    """UPDATE an appointment, refusing a double booking in the same statement.
+
+    Only an update that matched no row pays for the queries that say why.
+    """
+    free = stays_free(changes, await longest_booking(db))
+    async with _booking(db):
+        appointment = await update_object(
+            db, Appointment, appointment_id, changes,
+            conditions=() if free is None else (free,),
+        )
+    if appointment is not None:
+        return appointment
+
+    current = await db.get(Appointment, appointment_id)
+    if current is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
+        )
+    raise _double_booking(
+        await find_conflict(
+            db,
+            current.doctor_id,
+            changes.get("appointment_datetime", current.appointment_datetime),
+            changes.get("duration_minutes", current.duration_minutes),
+            exclude_id=appointment_id,
+        )
+    )
+
 
 @router.post("/", response_model=AppointmentResponse)
 async def create_appointment(
@@ -24,57 +102,99 @@ async def create_appointment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    # Verify patient exists
-    patient_result = await db.execute(
-        select(Patient).where(Patient.id == appointment_data.patient_id)
-    )
-    if not patient_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+    # The patient and doctor existence checks and the overlap check are part
+    # of the INSERT itself; only a failed insert pays for the queries that
+    # say why.
+    data = appointment_data.model_dump()
+    parents = {"patient_id": Patient, "doctor_id": Doctor}
+    free = ~exists().where(
+        overlapping(
+            data["doctor_id"],
+            data["appointment_datetime"],
+            data["duration_minutes"],
+            longest=await longest_booking(db),
         )
-
-    # Verify doctor exists
-    doctor_result = await db.execute(
-        select(Doctor).where(Doctor.id == appointment_data.doctor_id)
     )
-    if not doctor_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
+    async with _booking(db):
+        obj = await create_with_parents(db, Appointment, data, parents, conditions=[free])
+    if obj is None:
+        missing = await find_missing_parent(db, data, parents)
+        if missing is not None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{missing.__name__} not found",
+            )
+        raise _double_booking(
+            await find_conflict(
+                db, data["doctor_id"], data["appointment_datetime"], data["duration_minutes"]
+            )
         )
 
-    appointment = Appointment(**appointment_data.model_dump())
-    db.add(appointment)
-    await db.commit()
-    await db.refresh(appointment)
-    return appointment
+    return obj
 
 
-@router.get("/", response_model=List[AppointmentResponse])
-async def get_appointments(
-    skip: int = 0,
-    limit: int = 100,
+@router.post("/bulk", response_model=BulkCreateResponse, operation_id="create_appointments_bulk")
+async def create_appointments_bulk(
+    appointments: List[AppointmentCreate] = Body(
+        ..., min_length=1, max_length=settings.bulk_max_items
+    ),
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(
-        select(Appointment)
-        .options(selectinload(Appointment.patient), selectinload(Appointment.doctor))
-        .offset(skip)
-        .limit(limit)
-    )
-    appointments = result.scalars().all()
-    return appointments
+    async with _booking(db):
+        results = await bulk_create(
+            db,
+            Appointment,
+            [item.model_dump() for item in appointments],
+            parents={"patient_id": Patient, "doctor_id": Doctor},
+            check=find_batch_conflicts,
+        )
+    return BulkCreateResponse.from_results(results)
+
+
+@router.get(
+    "/",
+    response_model=List[AppointmentExpandedResponse],
+    response_model_exclude_unset=True,
+)
+async def get_appointments(
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    expand: Expand = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    if expand.names:
+        fields.forbid_with_expand()
+        query = select(Appointment).options(
+            *expand.options(Appointment, AppointmentExpandedResponse)
+        )
+        result = await db.execute(pagination.apply(query, Appointment))
+        return pagination.paginate([
+            expand.render(obj, AppointmentExpandedResponse, AppointmentResponse)
+            for obj in result.scalars().all()
+        ])
 
+    rows = fields.apply(appointment_rows)
+    query = rows.select()
+    result = await db.execute(pagination.apply(query, Appointment))
+    return pagination.render(result.all(), rows)
 
-@router.get("/{appointment_id}", response_model=AppointmentResponse)
+
+@router.get(
+    "/{appointment_id}",
+    response_model=AppointmentExpandedResponse,
+    response_model_exclude_unset=True,
+)
 async def get_appointment(
     appointment_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    expand: Expand = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     result = await db.execute(
         select(Appointment)
-        .options(selectinload(Appointment.patient), selectinload(Appointment.doctor))
+        .options(*expand.options(Appointment, AppointmentExpandedResponse))
         .where(Appointment.id == appointment_id)
     )
     appointment = result.scalar_one_or_none()
@@ -84,7 +204,7 @@ async def get_appointment(
             status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
         )
 
-    return appointment
+    return expand.render(appointment, AppointmentExpandedResponse, AppointmentResponse)
 
 
 @router.put(
@@ -98,23 +218,22 @@ async def update_appointment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(
-        select(Appointment).where(Appointment.id == appointment_id)
-    )
-    appointment = result.scalar_one_or_none()
-
-    if not appointment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
-        )
-
     update_data = appointment_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(appointment, field, value)
+    return await _update_booking(db, appointment_id, update_data)
+
 
-    await db.commit()
-    await db.refresh(appointment)
-    return appointment
+@router.patch(
+    "/{appointment_id}/status",
+    response_model=AppointmentResponse,
+    operation_id="update_appointment_status",
+)
+async def update_appointment_status(
+    appointment_id: int,
+    status_data: AppointmentStatusUpdate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    return await _update_booking(db, appointment_id, status_data.model_dump())
 
 
 @router.delete(
@@ -126,16 +245,25 @@ async def delete_appointment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(
-        select(Appointment).where(Appointment.id == appointment_id)
-    )
-    appointment = result.scalar_one_or_none()
-
-    if not appointment:
+    if not await delete_object(db, Appointment, appointment_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
         )
 
-    await db.delete(appointment)
-    await db.commit()
     return {"message": "Appointment deleted successfully"}
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=BulkDeleteResponse,
+    operation_id="bulk_delete_appointments",
+)
+async def bulk_delete_appointments(
+    request: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    deleted = await delete_objects(db, Appointment, request.ids)
+    return BulkDeleteResponse(
+        deleted=deleted, not_found=sorted(set(request.ids) - set(deleted))
+    )
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.api.dependencies.database import get_async_session
-from app.schemas.auth import UserCreate, UserResponse, Token
+from app.database.crud import create_object
+from app.schemas.auth import RefreshRequest, UserCreate, UserResponse, Token
 from app.models.user import User
-from app.auth.jwt_handler import create_access_token
-from app.core.security import verify_password, get_password_hash
+from app.auth.refresh_tokens import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from app.auth.stateless import issue_access_token
+from app.core.security import password_hasher
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -29,19 +31,17 @@ async def register(
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    user = User(
-        email=user_data.email,
-        username=user_data.username,
-        hashed_password=hashed_password,
+    hashed_password = await password_hasher.hash(user_data.password)
+    return await create_object(
+        db,
+        User,
+        {
+            "email": user_data.email,
+            "username": user_data.username,
+            "hashed_password": hashed_password,
+        },
     )
 
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-
-    return user
-
 
 @router.post("/login", response_model=Token)
 async def login(
@@ -51,12 +51,47 @@ async def login(
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid = False
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash is not None:
+        # Stored with an outdated scheme or cost: replace it while the
+        # plaintext is at hand. The password itself is unchanged, so tokens
+        # issued to other devices stay valid.
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash),
+            execution_options={"password_rehash": True},
+        )
+
+    access_token = await issue_access_token(db, user)
+    refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_async_session)):
+    rotated = await rotate_refresh_token(db, body.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user, refresh_token = rotated
+    access_token = await issue_access_token(db, user)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
 
-    access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/logout")
+async def logout(body: RefreshRequest, db: AsyncSession = Depends(get_async_session)):
+    await revoke_refresh_token(db, body.refresh_token)
+    return {"message": "Logged out successfully"}
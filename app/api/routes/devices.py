@@ -0,0 +1,174 @@
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import Field, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Annotated, List, Literal
+from app.api.dependencies.database import get_async_session, get_read_session
+from app.api.dependencies.auth import get_current_active_user
+from app.core.config import settings
+from app.database.bulk import bulk_insert
+from app.database.rollups import RESOLUTIONS, update_rollups
+from app.schemas.device import (
+    DeviceDataCreate,
+    DeviceDataIngestResponse,
+    DeviceDataRollupResponse,
+)
+from app.models.device import WearableDevice, DeviceData, DeviceDataRollup
+from app.models.user import User
+
+router = APIRouter(prefix="/devices", tags=["devices"])
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# max_length stops validation at the first reading past the limit instead of
+# validating the whole batch before rejecting it.
+device_data_batch = TypeAdapter(
+    Annotated[List[DeviceDataCreate], Field(max_length=settings.device_ingest_max_batch)]
+)
+
+_reading_schema = {"$ref": "#/components/schemas/DeviceDataCreate"}
+
+
+def _batch_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Batch exceeds {settings.device_ingest_max_batch} readings",
+    )
+
+
+def _utc(value: datetime) -> datetime:
+    # A bound without an offset means UTC, like the stored bucket starts.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+async def _read_body(request: Request) -> bytes:
+    """The request body, refused with 413 as soon as it passes the byte limit."""
+    limit = settings.device_ingest_max_body_bytes
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Body exceeds {limit} bytes",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+def _as_json_array(body: bytes, media_type: str) -> bytes:
+    if media_type not in NDJSON_MEDIA_TYPES:
+        return body
+    lines = [line for line in body.splitlines() if line.strip()]
+    if len(lines) > settings.device_ingest_max_batch:
+        raise _batch_too_large()
+    return b"[" + b",".join(lines) + b"]"
+
+
+@router.post(
+    "/data/batch",
+    response_model=DeviceDataIngestResponse,
+    operation_id="ingest_device_data",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": _reading_schema}
+                },
+                "application/x-ndjson": {"schema": _reading_schema},
+            },
+        }
+    },
+)
+async def ingest_device_data(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Ingest a batch of wearable readings as a JSON array or NDJSON."""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = _as_json_array(await _read_body(request), media_type)
+
+    try:
+        readings = device_data_batch.validate_json(body)
+    except ValidationError as exc:
+        errors = exc.errors(include_url=False, include_context=False)
+        if any(error["type"] == "too_long" and not error["loc"] for error in errors):
+            raise _batch_too_large()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors
+        )
+
+    device_ids = {reading.device_id for reading in readings}
+    if device_ids:
+        result = await db.execute(
+            select(WearableDevice.id).where(WearableDevice.id.in_(device_ids))
+        )
+        missing = device_ids - set(result.scalars().all())
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown device ids: {sorted(missing)}",
+            )
+
+    rows = device_data_batch.dump_python(readings)
+    ingested = await bulk_insert(db, DeviceData, rows)
+    await update_rollups(db, rows)
+    await db.commit()
+    return {"ingested": ingested}
+
+
+@router.get(
+    "/{device_id}/rollups",
+    response_model=List[DeviceDataRollupResponse],
+    operation_id="get_device_data_rollups",
+)
+async def get_device_data_rollups(
+    device_id: int,
+    data_type: str,
+    start: datetime,
+    end: datetime,
+    resolution: Literal["1m", "1h", "1d"] = Query("1h"),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Bucketed min/max/avg/count for one device and reading type in [start, end)."""
+    start, end = _utc(start), _utc(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start"
+        )
+    if (end - start) / RESOLUTIONS[resolution] > settings.device_rollup_max_buckets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Range too large for this resolution; use a coarser resolution",
+        )
+
+    result = await db.execute(
+        select(
+            DeviceDataRollup.device_id,
+            DeviceDataRollup.data_type,
+            DeviceDataRollup.resolution,
+            DeviceDataRollup.bucket_start,
+            DeviceDataRollup.count,
+            DeviceDataRollup.min,
+            DeviceDataRollup.max,
+            (DeviceDataRollup.sum / DeviceDataRollup.count).label("avg"),
+        )
+        .where(
+            DeviceDataRollup.device_id == device_id,
+            DeviceDataRollup.data_type == data_type,
+            DeviceDataRollup.resolution == resolution,
+            DeviceDataRollup.bucket_start >= start,
+            DeviceDataRollup.bucket_start < end,
+        )
+        .order_by(DeviceDataRollup.bucket_start)
+    )
+    return result.mappings().all()
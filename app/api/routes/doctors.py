@@ -1,15 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, timedelta
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
-from app.api.dependencies.database import get_async_session
+from sqlalchemy import exists, select
+from typing import List, Optional
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.pagination import Pagination
+from app.core.config import settings
+from app.database.availability import busy_intervals, clinic_hours, free_slots
+from app.database.crud import bulk_create, create_object, update_object, delete_object
+from app.schemas.appointment import DoctorAvailabilityResponse, TimeSlot
+from app.schemas.bulk import BulkCreateResponse
 from app.schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
 from app.models.doctor import Doctor
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/doctors", tags=["doctors"])
 
+doctor_rows = RowSerializer(Doctor, DoctorResponse)
+
 
 @router.post("/", response_model=DoctorResponse)
 async def create_doctor(
@@ -17,29 +28,42 @@ async def create_doctor(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    doctor = Doctor(**doctor_data.model_dump())
-    db.add(doctor)
-    await db.commit()
-    await db.refresh(doctor)
-    return doctor
+    return await create_object(db, Doctor, doctor_data.model_dump())
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, operation_id="create_doctors_bulk")
+async def create_doctors_bulk(
+    doctors: List[DoctorCreate] = Body(
+        ..., min_length=1, max_length=settings.bulk_max_items
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    results = await bulk_create(
+        db,
+        Doctor,
+        [item.model_dump() for item in doctors],
+        unique=("email", "license_number"),
+    )
+    return BulkCreateResponse.from_results(results)
 
 
 @router.get("/", response_model=List[DoctorResponse],operation_id="get_doctors")
 async def get_doctors(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Doctor).offset(skip).limit(limit))
-    doctors = result.scalars().all()
-    return doctors
+    rows = fields.apply(doctor_rows)
+    result = await db.execute(pagination.apply(rows.select(), Doctor))
+    return pagination.render(result.all(), rows)
 
 
 @router.get("/{doctor_id}", response_model=DoctorResponse,operation_id="get_doctor")
 async def get_doctor(
     doctor_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
@@ -53,6 +77,44 @@ async def get_doctor(
     return doctor
 
 
+@router.get(
+    "/{doctor_id}/availability",
+    response_model=DoctorAvailabilityResponse,
+    operation_id="get_doctor_availability",
+)
+async def get_doctor_availability(
+    doctor_id: int,
+    date_from: date,
+    date_to: Optional[date] = Query(None, description="Inclusive; defaults to a week from date_from"),
+    duration_minutes: int = Query(30, gt=0, le=settings.max_appointment_minutes),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Free slots of ``duration_minutes`` within clinic hours, excluding active bookings."""
+    if date_to is None:
+        date_to = date_from + timedelta(days=6)
+    if not 0 <= (date_to - date_from).days < settings.availability_max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"date_to must be on or after date_from and within {settings.availability_max_days} days",
+        )
+    if not await db.scalar(select(exists().where(Doctor.id == doctor_id))):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
+        )
+
+    hours = clinic_hours(date_from, date_to)
+    busy = []
+    if hours:
+        busy = await busy_intervals(db, doctor_id, hours[0][0], hours[-1][1])
+    slots = free_slots(busy, hours, duration_minutes, settings.availability_slot_minutes)
+    return DoctorAvailabilityResponse(
+        doctor_id=doctor_id,
+        duration_minutes=duration_minutes,
+        slots=[TimeSlot(start=start, end=end) for start, end in slots],
+    )
+
+
 @router.put("/{doctor_id}", response_model=DoctorResponse,operation_id="update_doctor")
 async def update_doctor(
     doctor_id: int,
@@ -60,20 +122,14 @@ async def update_doctor(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
-    doctor = result.scalar_one_or_none()
+    update_data = doctor_data.model_dump(exclude_unset=True)
+    doctor = await update_object(db, Doctor, doctor_id, update_data)
 
     if not doctor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
         )
 
-    update_data = doctor_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(doctor, field, value)
-
-    await db.commit()
-    await db.refresh(doctor)
     return doctor
 
 
@@ -83,14 +139,9 @@ async def delete_doctor(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
-    doctor = result.scalar_one_or_none()
-
-    if not doctor:
+    if not await delete_object(db, Doctor, doctor_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
         )
 
-    await db.delete(doctor)
-    await db.commit()
     return {"message": "Doctor deleted successfully"}
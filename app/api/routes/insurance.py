@@ -1,20 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from typing import List
-from app.api.dependencies.database import get_async_session
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.export import EXPORT_RESPONSES, Export
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.filters import ListFilters
+from app.api.dependencies.pagination import Pagination
+from app.database.crud import create_object, update_object, delete_object, delete_objects
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
 from app.schemas.insurance import (
     InsurancePlanCreate, InsurancePlanResponse,
-    InsuranceClaimCreate, InsuranceClaimResponse,
+    InsuranceClaimCreate, InsuranceClaimStatusUpdate, InsuranceClaimResponse,
     PaymentCreate, PaymentResponse,
     InvoiceCreate, InvoiceResponse
 )
 from app.models.insurance import InsurancePlan, InsuranceClaim, Payment, Invoice
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/insurance", tags=["insurance"])
 
+insurance_plan_rows = RowSerializer(InsurancePlan, InsurancePlanResponse)
+insurance_claim_rows = RowSerializer(InsuranceClaim, InsuranceClaimResponse)
+payment_rows = RowSerializer(Payment, PaymentResponse)
+invoice_rows = RowSerializer(Invoice, InvoiceResponse)
+
 # Insurance Plans
 @router.post("/plans/", response_model=InsurancePlanResponse)
 async def create_insurance_plan(
@@ -22,26 +34,23 @@ async def create_insurance_plan(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = InsurancePlan(**plan.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, InsurancePlan, plan.model_dump())
 
 @router.get("/plans/", response_model=List[InsurancePlanResponse])
 async def list_insurance_plans(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(InsurancePlan).offset(skip).limit(limit))
-    return result.scalars().all()
+    rows = fields.apply(insurance_plan_rows)
+    result = await db.execute(pagination.apply(rows.select(), InsurancePlan))
+    return pagination.render(result.all(), rows)
 
 @router.get("/plans/{plan_id}", response_model=InsurancePlanResponse)
 async def get_insurance_plan(
     plan_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     obj = await db.get(InsurancePlan, plan_id)
@@ -56,13 +65,9 @@ async def update_insurance_plan(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(InsurancePlan, plan_id)
+    obj = await update_object(db, InsurancePlan, plan_id, plan.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Insurance plan not found")
-    for k, v in plan.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/plans/{plan_id}")
@@ -71,11 +76,8 @@ async def delete_insurance_plan(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(InsurancePlan, plan_id)
-    if not obj:
+    if not await delete_object(db, InsurancePlan, plan_id):
         raise HTTPException(status_code=404, detail="Insurance plan not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True}
 
 # Insurance Claims
@@ -85,26 +87,37 @@ async def create_insurance_claim(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = InsuranceClaim(**claim.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, InsuranceClaim, claim.model_dump())
 
 @router.get("/claims/", response_model=List[InsuranceClaimResponse])
 async def list_insurance_claims(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    rows = fields.apply(insurance_claim_rows)
+    result = await db.execute(pagination.apply(rows.select(), InsuranceClaim))
+    return pagination.render(result.all(), rows)
+
+@router.get("/claims/export", responses=EXPORT_RESPONSES)
+async def export_insurance_claims(
+    export: Export = Depends(),
+    filters: ListFilters = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(InsuranceClaim).offset(skip).limit(limit))
-    return result.scalars().all()
+    query = filters.apply(
+        select(InsuranceClaim), InsuranceClaim, date_column=InsuranceClaim.claim_date
+    )
+    return export.stream(
+        db, query, InsuranceClaim, InsuranceClaimResponse, filename="insurance_claims"
+    )
 
 @router.get("/claims/{claim_id}", response_model=InsuranceClaimResponse)
 async def get_insurance_claim(
     claim_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     obj = await db.get(InsuranceClaim, claim_id)
@@ -119,13 +132,21 @@ async def update_insurance_claim(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(InsuranceClaim, claim_id)
+    obj = await update_object(db, InsuranceClaim, claim_id, claim.model_dump())
+    if not obj:
+        raise HTTPException(status_code=404, detail="Insurance claim not found")
+    return obj
+
+@router.patch("/claims/{claim_id}/status", response_model=InsuranceClaimResponse)
+async def update_insurance_claim_status(
+    claim_id: int,
+    claim_status: InsuranceClaimStatusUpdate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    obj = await update_object(db, InsuranceClaim, claim_id, claim_status.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Insurance claim not found")
-    for k, v in claim.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/claims/{claim_id}")
@@ -134,11 +155,8 @@ async def delete_insurance_claim(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(InsuranceClaim, claim_id)
-    if not obj:
+    if not await delete_object(db, InsuranceClaim, claim_id):
         raise HTTPException(status_code=404, detail="Insurance claim not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True}
 
 # Payments
@@ -148,26 +166,33 @@ async def create_payment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = Payment(**payment.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, Payment, payment.model_dump())
 
 @router.get("/payments/", response_model=List[PaymentResponse])
 async def list_payments(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Payment).offset(skip).limit(limit))
-    return result.scalars().all()
+    rows = fields.apply(payment_rows)
+    result = await db.execute(pagination.apply(rows.select(), Payment))
+    return pagination.render(result.all(), rows)
+
+@router.get("/payments/export", responses=EXPORT_RESPONSES)
+async def export_payments(
+    export: Export = Depends(),
+    filters: ListFilters = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    query = filters.apply(select(Payment), Payment, date_column=Payment.payment_date)
+    return export.stream(db, query, Payment, PaymentResponse, filename="payments")
 
 @router.get("/payments/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
     payment_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     obj = await db.get(Payment, payment_id)
@@ -182,13 +207,9 @@ async def update_payment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(Payment, payment_id)
+    obj = await update_object(db, Payment, payment_id, payment.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Payment not found")
-    for k, v in payment.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/payments/{payment_id}")
@@ -197,13 +218,21 @@ async def delete_payment(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(Payment, payment_id)
-    if not obj:
+    if not await delete_object(db, Payment, payment_id):
         raise HTTPException(status_code=404, detail="Payment not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True}
 
+@router.post("/payments/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_payments(
+    request: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    deleted = await delete_objects(db, Payment, request.ids)
+    return BulkDeleteResponse(
+        deleted=deleted, not_found=sorted(set(request.ids) - set(deleted))
+    )
+
 # Invoices
 @router.post("/invoices/", response_model=InvoiceResponse)
 async def create_invoice(
@@ -211,26 +240,23 @@ async def create_invoice(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = Invoice(**invoice.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, Invoice, invoice.model_dump())
 
 @router.get("/invoices/", response_model=List[InvoiceResponse])
 async def list_invoices(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Invoice).offset(skip).limit(limit))
-    return result.scalars().all()
+    rows = fields.apply(invoice_rows)
+    result = await db.execute(pagination.apply(rows.select(), Invoice))
+    return pagination.render(result.all(), rows)
 
 @router.get("/invoices/{invoice_id}", response_model=InvoiceResponse)
 async def get_invoice(
     invoice_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     obj = await db.get(Invoice, invoice_id)
@@ -245,13 +271,9 @@ async def update_invoice(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(Invoice, invoice_id)
+    obj = await update_object(db, Invoice, invoice_id, invoice.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    for k, v in invoice.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/invoices/{invoice_id}")
@@ -260,9 +282,10 @@ async def delete_invoice(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    obj = await db.get(Invoice, invoice_id)
-    if not obj:
+    # Payments outlive their invoice: detach them instead of tripping the FK.
+    await db.execute(
+        update(Payment).where(Payment.invoice_id == invoice_id).values(invoice_id=None)
+    )
+    if not await delete_object(db, Invoice, invoice_id):
         raise HTTPException(status_code=404, detail="Invoice not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True} 
\ No newline at end of file
@@ -1,22 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from typing import List
-from app.api.dependencies.database import get_async_session
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.expand import Expand
+from app.api.dependencies.export import EXPORT_RESPONSES, Export
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.filters import ListFilters
+from app.api.dependencies.pagination import Pagination
+from app.core.config import settings
+from app.database.crud import (
+    bulk_create,
+    create_with_parents,
+    delete_object,
+    delete_objects,
+    find_missing_parent,
+    update_object,
+)
+from app.schemas.bulk import BulkCreateResponse, BulkDeleteRequest, BulkDeleteResponse
 from app.schemas.medical_record import (
     MedicalRecordCreate,
     MedicalRecordUpdate,
     MedicalRecordResponse,
+    MedicalRecordExpandedResponse,
 )
 from app.models.medical_record import MedicalRecord
 from app.models.patient import Patient
 from app.models.doctor import Doctor
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/medical-records", tags=["medical-records"])
 
+medical_record_rows = RowSerializer(MedicalRecord, MedicalRecordResponse)
+
 
 @router.post("/", response_model=MedicalRecordResponse, operation_id="create_medical_record")
 async def create_medical_record(
@@ -24,63 +42,113 @@ async def create_medical_record(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    # Verify patient exists
-    patient_result = await db.execute(
-        select(Patient).where(Patient.id == record_data.patient_id)
-    )
-    if not patient_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-        )
-
-    # Verify doctor exists
-    doctor_result = await db.execute(
-        select(Doctor).where(Doctor.id == record_data.doctor_id)
+    # The patient and doctor existence checks are part of the INSERT itself;
+    # only a failed insert pays for the query that says which one is missing.
+    data = record_data.model_dump()
+    parents = {"patient_id": Patient, "doctor_id": Doctor}
+    obj = await create_with_parents(db, MedicalRecord, data, parents)
+    if obj is None:
+        missing = await find_missing_parent(db, data, parents)
+        if missing is not None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{missing.__name__} not found",
+            )
+        # Both parents exist now, so one was inserted concurrently after the
+        # INSERT looked for it; try once more.
+        obj = await create_with_parents(db, MedicalRecord, data, parents)
+        if obj is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Patient or doctor changed during the request, retry",
+            )
+
+    return obj
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, operation_id="create_medical_records_bulk")
+async def create_medical_records_bulk(
+    medical_records: List[MedicalRecordCreate] = Body(
+        ..., min_length=1, max_length=settings.bulk_max_items
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    results = await bulk_create(
+        db,
+        MedicalRecord,
+        [item.model_dump() for item in medical_records],
+        parents={"patient_id": Patient, "doctor_id": Doctor},
     )
-    if not doctor_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
-        )
+    return BulkCreateResponse.from_results(results)
 
-    record = MedicalRecord(**record_data.model_dump())
-    db.add(record)
-    await db.commit()
-    await db.refresh(record)
-    return record
 
-
-@router.get("/", response_model=List[MedicalRecordResponse], operation_id="get_medical_records")
+@router.get(
+    "/",
+    response_model=List[MedicalRecordExpandedResponse],
+    response_model_exclude_unset=True,
+    operation_id="get_medical_records",
+)
 async def get_medical_records(
-    skip: int = 0,
-    limit: int = 100,
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    expand: Expand = Depends(),
     patient_id: int = None,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    query = select(MedicalRecord).options(
-        selectinload(MedicalRecord.patient), selectinload(MedicalRecord.doctor)
-    )
+    if expand.names:
+        fields.forbid_with_expand()
+        query = select(MedicalRecord).options(
+            *expand.options(MedicalRecord, MedicalRecordExpandedResponse)
+        )
+    else:
+        rows = fields.apply(medical_record_rows)
+        query = rows.select()
 
     if patient_id:
         query = query.where(MedicalRecord.patient_id == patient_id)
 
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    records = result.scalars().all()
-    return records
+    result = await db.execute(pagination.apply(query, MedicalRecord))
+    if expand.names:
+        return pagination.paginate([
+            expand.render(obj, MedicalRecordExpandedResponse, MedicalRecordResponse)
+            for obj in result.scalars().all()
+        ])
+    return pagination.render(result.all(), rows)
+
+
+@router.get("/export", responses=EXPORT_RESPONSES, operation_id="export_medical_records")
+async def export_medical_records(
+    export: Export = Depends(),
+    filters: ListFilters = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stream every matching medical record as NDJSON or CSV."""
+    query = filters.apply(
+        select(MedicalRecord), MedicalRecord, date_column=MedicalRecord.visit_date
+    )
+    return export.stream(
+        db, query, MedicalRecord, MedicalRecordResponse, filename="medical_records"
+    )
 
 
-@router.get("/{record_id}", response_model=MedicalRecordResponse, operation_id="get_medical_record")
+@router.get(
+    "/{record_id}",
+    response_model=MedicalRecordExpandedResponse,
+    response_model_exclude_unset=True,
+    operation_id="get_medical_record",
+)
 async def get_medical_record(
     record_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    expand: Expand = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     result = await db.execute(
         select(MedicalRecord)
-        .options(
-            selectinload(MedicalRecord.patient), selectinload(MedicalRecord.doctor)
-        )
+        .options(*expand.options(MedicalRecord, MedicalRecordExpandedResponse))
         .where(MedicalRecord.id == record_id)
     )
     record = result.scalar_one_or_none()
@@ -90,7 +158,7 @@ async def get_medical_record(
             status_code=status.HTTP_404_NOT_FOUND, detail="Medical record not found"
         )
 
-    return record
+    return expand.render(record, MedicalRecordExpandedResponse, MedicalRecordResponse)
 
 
 @router.put("/{record_id}", response_model=MedicalRecordResponse, operation_id="update_medical_record")
@@ -100,22 +168,14 @@ async def update_medical_record(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(
-        select(MedicalRecord).where(MedicalRecord.id == record_id)
-    )
-    record = result.scalar_one_or_none()
+    update_data = record_data.model_dump(exclude_unset=True)
+    record = await update_object(db, MedicalRecord, record_id, update_data)
 
     if not record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Medical record not found"
         )
 
-    update_data = record_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(record, field, value)
-
-    await db.commit()
-    await db.refresh(record)
     return record
 
 
@@ -125,16 +185,25 @@ async def delete_medical_record(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(
-        select(MedicalRecord).where(MedicalRecord.id == record_id)
-    )
-    record = result.scalar_one_or_none()
-
-    if not record:
+    if not await delete_object(db, MedicalRecord, record_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Medical record not found"
         )
 
-    await db.delete(record)
-    await db.commit()
     return {"message": "Medical record deleted successfully"}
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=BulkDeleteResponse,
+    operation_id="bulk_delete_medical_records",
+)
+async def bulk_delete_medical_records(
+    request: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    deleted = await delete_objects(db, MedicalRecord, request.ids)
+    return BulkDeleteResponse(
+        deleted=deleted, not_found=sorted(set(request.ids) - set(deleted))
+    )
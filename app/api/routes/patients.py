@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
-from app.api.dependencies.database import get_async_session
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.pagination import Pagination
+from app.core.config import settings
+from app.database.crud import bulk_create, create_object, update_object, delete_object
+from app.schemas.bulk import BulkCreateResponse
 from app.schemas.patient import PatientCreate, PatientUpdate, PatientResponse
 from app.models.patient import Patient
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
+patient_rows = RowSerializer(Patient, PatientResponse)
+
 
 @router.post("/", response_model=PatientResponse, operation_id="create_patient")
 async def create_patient(
@@ -17,29 +25,42 @@ async def create_patient(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    patient = Patient(**patient_data.model_dump())
-    db.add(patient)
-    await db.commit()
-    await db.refresh(patient)
-    return patient
+    return await create_object(db, Patient, patient_data.model_dump())
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, operation_id="create_patients_bulk")
+async def create_patients_bulk(
+    patients: List[PatientCreate] = Body(
+        ..., min_length=1, max_length=settings.bulk_max_items
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    results = await bulk_create(
+        db,
+        Patient,
+        [item.model_dump() for item in patients],
+        unique=("email",),
+    )
+    return BulkCreateResponse.from_results(results)
 
 
 @router.get("/", response_model=List[PatientResponse], operation_id="get_patients")
 async def get_patients(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    fields: SparseFields = Depends(),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Patient).offset(skip).limit(limit))
-    patients = result.scalars().all()
-    return patients
+    rows = fields.apply(patient_rows)
+    result = await db.execute(pagination.apply(rows.select(), Patient))
+    return pagination.render(result.all(), rows)
 
 
 @router.get("/{patient_id}", response_model=PatientResponse, operation_id="get_patient")
 async def get_patient(
     patient_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     result = await db.execute(select(Patient).where(Patient.id == patient_id))
@@ -60,20 +81,14 @@ async def update_patient(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Patient).where(Patient.id == patient_id))
-    patient = result.scalar_one_or_none()
+    update_data = patient_data.model_dump(exclude_unset=True)
+    patient = await update_object(db, Patient, patient_id, update_data)
 
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
         )
 
-    update_data = patient_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(patient, field, value)
-
-    await db.commit()
-    await db.refresh(patient)
     return patient
 
 
@@ -83,14 +98,9 @@ async def delete_patient(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    result = await db.execute(select(Patient).where(Patient.id == patient_id))
-    patient = result.scalar_one_or_none()
-
-    if not patient:
+    if not await delete_object(db, Patient, patient_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
         )
 
-    await db.delete(patient)
-    await db.commit()
     return {"message": "Patient deleted successfully"}
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
-from app.api.dependencies.database import get_async_session
+from app.api.dependencies.database import get_async_session, get_read_session
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.fields import SparseFields
+from app.api.dependencies.filters import ListFilters
+from app.api.dependencies.pagination import Pagination
+from app.database.crud import create_object, update_object, delete_object
 from app.schemas.pharmacy import (
     MedicationCreate, MedicationResponse,
     PrescriptionCreate, PrescriptionResponse,
@@ -11,25 +14,28 @@ from app.schemas.pharmacy import (
 )
 from app.models.pharmacy import Medication, Prescription, PharmacyOrder
 from app.models.user import User
+from app.utils.serialization import RowSerializer
 
 router = APIRouter(prefix="/pharmacy", tags=["pharmacy"])
 
+medication_rows = RowSerializer(Medication, MedicationResponse)
+prescription_rows = RowSerializer(Prescription, PrescriptionResponse)
+pharmacy_order_rows = RowSerializer(PharmacyOrder, PharmacyOrderResponse)
+
 # Medication endpoints
 @router.post("/medications/", response_model=MedicationResponse)
 async def create_medication(med: MedicationCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = Medication(**med.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, Medication, med.model_dump())
 
 @router.get("/medications/", response_model=List[MedicationResponse])
-async def list_medications(db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    result = await db.execute(select(Medication))
-    return result.scalars().all()
+async def list_medications(pagination: Pagination = Depends(), fields: SparseFields = Depends(), filters: ListFilters = Depends(), db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
+    rows = fields.apply(medication_rows)
+    query = filters.apply(rows.select(), Medication, date_column=Medication.created_at)
+    result = await db.execute(pagination.apply(query, Medication))
+    return pagination.render(result.all(), rows)
 
 @router.get("/medications/{med_id}", response_model=MedicationResponse)
-async def get_medication(med_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
+async def get_medication(med_id: int, db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
     obj = await db.get(Medication, med_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Medication not found")
@@ -37,40 +43,31 @@ async def get_medication(med_id: int, db: AsyncSession = Depends(get_async_sessi
 
 @router.put("/medications/{med_id}", response_model=MedicationResponse)
 async def update_medication(med_id: int, med: MedicationCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(Medication, med_id)
+    obj = await update_object(db, Medication, med_id, med.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Medication not found")
-    for k, v in med.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/medications/{med_id}")
 async def delete_medication(med_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(Medication, med_id)
-    if not obj:
+    if not await delete_object(db, Medication, med_id):
         raise HTTPException(status_code=404, detail="Medication not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True}
 
 # Prescription endpoints
 @router.post("/prescriptions/", response_model=PrescriptionResponse)
 async def create_prescription(pres: PrescriptionCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = Prescription(**pres.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, Prescription, pres.model_dump())
 
 @router.get("/prescriptions/", response_model=List[PrescriptionResponse])
-async def list_prescriptions(db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    result = await db.execute(select(Prescription))
-    return result.scalars().all()
+async def list_prescriptions(pagination: Pagination = Depends(), fields: SparseFields = Depends(), filters: ListFilters = Depends(), db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
+    rows = fields.apply(prescription_rows)
+    query = filters.apply(rows.select(), Prescription, date_column=Prescription.issue_date)
+    result = await db.execute(pagination.apply(query, Prescription))
+    return pagination.render(result.all(), rows)
 
 @router.get("/prescriptions/{pres_id}", response_model=PrescriptionResponse)
-async def get_prescription(pres_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
+async def get_prescription(pres_id: int, db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
     obj = await db.get(Prescription, pres_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Prescription not found")
@@ -78,40 +75,31 @@ async def get_prescription(pres_id: int, db: AsyncSession = Depends(get_async_se
 
 @router.put("/prescriptions/{pres_id}", response_model=PrescriptionResponse)
 async def update_prescription(pres_id: int, pres: PrescriptionCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(Prescription, pres_id)
+    obj = await update_object(db, Prescription, pres_id, pres.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Prescription not found")
-    for k, v in pres.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/prescriptions/{pres_id}")
 async def delete_prescription(pres_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(Prescription, pres_id)
-    if not obj:
+    if not await delete_object(db, Prescription, pres_id):
         raise HTTPException(status_code=404, detail="Prescription not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True}
 
 # PharmacyOrder endpoints
 @router.post("/orders/", response_model=PharmacyOrderResponse)
 async def create_pharmacy_order(order: PharmacyOrderCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = PharmacyOrder(**order.model_dump())
-    db.add(obj)
-    await db.commit()
-    await db.refresh(obj)
-    return obj
+    return await create_object(db, PharmacyOrder, order.model_dump())
 
 @router.get("/orders/", response_model=List[PharmacyOrderResponse])
-async def list_pharmacy_orders(db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    result = await db.execute(select(PharmacyOrder))
-    return result.scalars().all()
+async def list_pharmacy_orders(pagination: Pagination = Depends(), fields: SparseFields = Depends(), filters: ListFilters = Depends(), db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
+    rows = fields.apply(pharmacy_order_rows)
+    query = filters.apply(rows.select(), PharmacyOrder, date_column=PharmacyOrder.order_date)
+    result = await db.execute(pagination.apply(query, PharmacyOrder))
+    return pagination.render(result.all(), rows)
 
 @router.get("/orders/{order_id}", response_model=PharmacyOrderResponse)
-async def get_pharmacy_order(order_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
+async def get_pharmacy_order(order_id: int, db: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_active_user)):
     obj = await db.get(PharmacyOrder, order_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Pharmacy order not found")
@@ -119,20 +107,13 @@ async def get_pharmacy_order(order_id: int, db: AsyncSession = Depends(get_async
 
 @router.put("/orders/{order_id}", response_model=PharmacyOrderResponse)
 async def update_pharmacy_order(order_id: int, order: PharmacyOrderCreate, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(PharmacyOrder, order_id)
+    obj = await update_object(db, PharmacyOrder, order_id, order.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="Pharmacy order not found")
-    for k, v in order.model_dump().items():
-        setattr(obj, k, v)
-    await db.commit()
-    await db.refresh(obj)
     return obj
 
 @router.delete("/orders/{order_id}")
 async def delete_pharmacy_order(order_id: int, db: AsyncSession = Depends(get_async_session), current_user: User = Depends(get_current_active_user)):
-    obj = await db.get(PharmacyOrder, order_id)
-    if not obj:
+    if not await delete_object(db, PharmacyOrder, order_id):
         raise HTTPException(status_code=404, detail="Pharmacy order not found")
-    await db.delete(obj)
-    await db.commit()
     return {"ok": True} 
\ No newline at end of file
@@ -1,7 +1,75 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Any, Optional, Protocol
 from app.core.config import settings
+from app.utils.cache import CacheBackend, TTLCache
+
+
+class TokenError(Exception):
+    """A token failed signature or claim validation, whatever the backend."""
+
+
+class JWTBackend(Protocol):
+    """The two operations the app needs from a JWT library."""
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str: ...
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict: ...
+
+
+class JoseBackend:
+    """python-jose, the default."""
+
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as error:
+            raise TokenError(str(error)) from error
+
+
+class PyJWTBackend:
+    """PyJWT; needs the ``pyjwt`` package (the pyjwt extra)."""
+
+    def __init__(self):
+        import jwt
+
+        self._jwt = jwt
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.InvalidTokenError as error:
+            raise TokenError(str(error)) from error
+
+
+JWT_BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+_backend: JWTBackend = JWT_BACKENDS[settings.jwt_backend]()
+
+# Verified token -> claims. Entries never outlive the token's own ``exp``.
+_claims_cache: CacheBackend = TTLCache(max_size=settings.token_cache_max_size)
+
+
+def set_jwt_backend(backend: JWTBackend) -> None:
+    global _backend
+    _backend = backend
+    clear_token_cache()
+
+
+def clear_token_cache() -> None:
+    _claims_cache.clear()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -14,20 +82,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         )
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
+    encoded_jwt = _backend.encode(
         to_encode, settings.secret_key, algorithm=settings.algorithm
     )
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
+def decode_token(token: str) -> Optional[dict[str, Any]]:
+    """Return the verified claims of ``token``, or None if it is invalid or expired.
+
+    A token is reused for every request during its lifetime, so verified
+    claims are cached until the token's ``exp`` and later requests skip the
+    signature check and claim parsing entirely.
+    """
+    if settings.token_cache_enabled:
+        claims = _claims_cache.get(token)
+        if claims is not None:
+            return claims
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
-    except JWTError:
+        claims = _backend.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except TokenError:
+        return None
+    if settings.token_cache_enabled:
+        expires_at = claims.get("exp")
+        # Tokens without an expiry are verified every time rather than cached forever.
+        if isinstance(expires_at, (int, float)):
+            ttl = expires_at - time.time()
+            if ttl > 0:
+                _claims_cache.set(token, claims, ttl)
+    return claims
+
+
+def verify_token(token: str) -> Optional[str]:
+    claims = decode_token(token)
+    if claims is None:
         return None
+    return claims.get("sub")
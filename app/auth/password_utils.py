@@ -1,3 +1,3 @@
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_password, get_password_hash, password_hasher
 
-__all__ = ["verify_password", "get_password_hash"]
+__all__ = ["verify_password", "get_password_hash", "password_hasher"]
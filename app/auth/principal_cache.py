@@ -0,0 +1,56 @@
+from typing import Optional
+from app.auth.user_events import on_user_changed
+from app.core.config import settings
+from app.models.user import User
+from app.utils.cache import CacheBackend, TTLCache
+
+# Columns copied into the cache. The password hash is deliberately left out:
+# nothing downstream of authentication needs it.
+PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "is_active",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+_backend: CacheBackend = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+
+def set_principal_cache_backend(backend: CacheBackend) -> None:
+    """Swap the in-process cache for a shared one (e.g. Redis-backed)."""
+    global _backend
+    _backend = backend
+
+
+def get_cached_principal(username: str) -> Optional[User]:
+    if not settings.principal_cache_enabled:
+        return None
+    data = _backend.get(username)
+    if data is None:
+        return None
+    # Detached instance: safe to read, never attached to a session.
+    return User(**data)
+
+
+def cache_principal(user: User) -> None:
+    if not settings.principal_cache_enabled:
+        return
+    data = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    _backend.set(user.username, data, settings.principal_cache_ttl_seconds)
+
+
+def invalidate_principal(username: str) -> None:
+    _backend.delete(username)
+
+
+def clear_principal_cache() -> None:
+    _backend.clear()
+
+
+on_user_changed(invalidate_principal)
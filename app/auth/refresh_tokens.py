@@ -0,0 +1,181 @@
+"""Long-lived refresh tokens, rotated on every use and stored server side.
+
+A refresh token is an opaque random string; the table keeps only its HMAC, so
+renewing an access token costs one HMAC and an indexed lookup instead of a
+password verification. Every refresh revokes the presented token and issues a
+new one in the same family. A token presented after it was rotated means it
+leaked (or the client raced itself), so the whole family is revoked and the
+user has to log in again.
+
+Issued tokens and revoked families are also kept in process-local caches:
+a token renewed by the worker that issued it skips the lookup query, and a
+token from a revoked family is rejected without touching the database.
+
+Every refresh adds a row, so issuing also deletes a batch of expired rows
+now and then. Rotated rows are kept until they expire, which is as long as
+presenting them can still be detected as reuse.
+"""
+import hashlib
+import hmac
+import secrets
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.utils.cache import CacheBackend, TTLCache
+
+
+@dataclass(frozen=True)
+class _Issued:
+    id: int
+    user_id: int
+    family_id: str
+    expires_at: datetime
+
+
+_LIFETIME = settings.refresh_token_expire_days * 24 * 3600
+
+# Token hash -> _Issued, for tokens that have not been used yet.
+_issued: CacheBackend = TTLCache(max_size=settings.refresh_token_cache_max_size, ttl=_LIFETIME)
+# Family id -> True. No token of a family outlives the family's last rotation
+# by more than one lifetime.
+_revoked_families: CacheBackend = TTLCache(
+    max_size=settings.refresh_token_cache_max_size, ttl=_LIFETIME
+)
+# Monotonic time of this worker's last purge of expired rows.
+_last_purge: Optional[float] = None
+
+
+def set_refresh_token_backends(issued: CacheBackend, revoked_families: CacheBackend) -> None:
+    """Share the caches between workers (e.g. Redis-backed) instead of per process."""
+    global _issued, _revoked_families
+    _issued = issued
+    _revoked_families = revoked_families
+
+
+def clear_refresh_token_cache() -> None:
+    _issued.clear()
+    _revoked_families.clear()
+
+
+def hash_refresh_token(token: str) -> str:
+    return hmac.new(settings.secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def purge_expired_refresh_tokens(
+    db: AsyncSession, batch_size: int = settings.refresh_token_purge_batch_size
+) -> int:
+    """Delete up to ``batch_size`` expired tokens and return how many; the caller commits."""
+    expired = (
+        select(RefreshToken.id)
+        .where(RefreshToken.expires_at < datetime.now(timezone.utc))
+        .limit(batch_size)
+    )
+    result = await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired)))
+    return result.rowcount
+
+
+async def _purge_if_due(db: AsyncSession) -> None:
+    global _last_purge
+    now = time.monotonic()
+    if _last_purge is not None and now - _last_purge < settings.refresh_token_purge_interval_seconds:
+        return
+    _last_purge = now
+    await purge_expired_refresh_tokens(db)
+
+
+async def issue_refresh_token(
+    db: AsyncSession, user_id: int, family_id: Optional[str] = None
+) -> str:
+    """Add a new refresh token for ``user_id`` to the session; the caller commits."""
+    await _purge_if_due(db)
+    token = secrets.token_urlsafe(32)
+    row = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days),
+    )
+    db.add(row)
+    await db.flush()
+    _issued.set(row.token_hash, _Issued(row.id, row.user_id, row.family_id, row.expires_at))
+    return token
+
+
+async def _lookup(db: AsyncSession, token_hash: str) -> Optional[_Issued]:
+    """The unused token with this hash; a rotated one revokes its family instead."""
+    issued = _issued.get(token_hash)
+    if issued is not None:
+        return issued
+    result = await db.execute(select(RefreshToken).where(RefreshToken.token_hash == token_hash))
+    row = result.scalar_one_or_none()
+    if row is None:
+        return None
+    if row.revoked_at is not None:
+        await revoke_family(db, row.family_id)
+        return None
+    return _Issued(row.id, row.user_id, row.family_id, row.expires_at)
+
+
+async def revoke_family(db: AsyncSession, family_id: str) -> None:
+    _revoked_families.set(family_id, True)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[tuple[User, str]]:
+    """Exchange a refresh token for its successor.
+
+    Returns the token's user and the new refresh token, or None if the token
+    is unknown, expired, revoked or its user is inactive.
+    """
+    token_hash = hash_refresh_token(token)
+    issued = await _lookup(db, token_hash)
+    if issued is None or _revoked_families.get(issued.family_id):
+        return None
+    if _utc(issued.expires_at) <= datetime.now(timezone.utc):
+        return None
+
+    # Claim the token atomically: of two concurrent uses only one updates
+    # the row, and the other is treated as reuse.
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == issued.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    _issued.delete(token_hash)
+    if claimed.rowcount != 1:
+        await revoke_family(db, issued.family_id)
+        return None
+
+    user = await db.get(User, issued.user_id)
+    if user is None or not user.is_active:
+        await db.commit()
+        return None
+    new_token = await issue_refresh_token(db, user.id, issued.family_id)
+    await db.commit()
+    return user, new_token
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Log out: revoke ``token`` and every token rotated from the same login."""
+    token_hash = hash_refresh_token(token)
+    issued = await _lookup(db, token_hash)
+    if issued is not None:
+        _issued.delete(token_hash)
+        await revoke_family(db, issued.family_id)
@@ -0,0 +1,157 @@
+"""Access tokens that carry the caller's authorization, so requests skip the users table.
+
+With ``settings.stateless_auth`` on, login embeds the user id, active and
+superuser flags, role names and permission names in a short-lived token. A
+request presenting such a token is authorized from its claims alone; the only
+server-side state consulted is the in-memory revocation list, which drops
+single tokens (by ``jti``) or every token issued to a user up to a point in
+time (e.g. after the user is deactivated).
+"""
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Mapping, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.jwt_handler import create_access_token
+from app.auth.user_events import on_user_changed
+from app.core.config import settings
+from app.models.role import Permission, Role, RolePermission, UserRole
+from app.models.user import User
+from app.utils.cache import CacheBackend, CacheFull, ExpiringStore
+
+# Revocations only need to outlive the tokens they cover, which is at most
+# one stateless token lifetime. Unlike the other caches this one never evicts
+# a live entry: a forgotten revocation would make its token valid again.
+_revoked: CacheBackend = ExpiringStore(
+    max_size=settings.revocation_list_max_size,
+    ttl=settings.stateless_token_expire_minutes * 60,
+)
+# Set when a revocation could not be recorded: every token issued up to then
+# is rejected, as if each of its subjects had been revoked.
+_revoked_before: Optional[int] = None
+
+
+def set_revocation_backend(backend: CacheBackend) -> None:
+    """Share revocations between workers (e.g. Redis-backed) instead of per process.
+
+    The backend must keep entries until they expire and raise ``CacheFull``
+    rather than evict when it runs out of room.
+    """
+    global _revoked
+    _revoked = backend
+
+
+def clear_revocations() -> None:
+    global _revoked_before
+    _revoked.clear()
+    _revoked_before = None
+
+
+def _record(key: tuple, value: Any) -> None:
+    global _revoked_before
+    try:
+        _revoked.set(key, value)
+    except CacheFull:
+        # Fail closed: users log in again rather than a revoked token passing.
+        _revoked_before = time.time_ns()
+
+
+def revoke_token(jti: str) -> None:
+    _record(("jti", jti), True)
+
+
+def revoke_subject(username: str) -> None:
+    """Invalidate every stateless token issued to ``username`` so far."""
+    _record(("sub", username), time.time_ns())
+
+
+def is_revoked(claims: Mapping[str, Any]) -> bool:
+    # Nanosecond issue times: the second-resolution ``iat`` would also reject
+    # a token issued right after the revocation, e.g. on re-login.
+    issued_at = claims.get("iat_ns", 0)
+    if _revoked_before is not None and issued_at <= _revoked_before:
+        return True
+    if _revoked.get(("jti", claims.get("jti"))):
+        return True
+    revoked_at = _revoked.get(("sub", claims.get("sub")))
+    return revoked_at is not None and issued_at <= revoked_at
+
+
+async def load_authorization(db: AsyncSession, user_id: int) -> tuple[list[str], list[str]]:
+    """Names of the user's roles and of the permissions those roles grant."""
+    roles = await db.execute(
+        select(Role.name)
+        .join(UserRole, UserRole.role_id == Role.id)
+        .where(UserRole.user_id == user_id)
+        .order_by(Role.name)
+    )
+    permissions = await db.execute(
+        select(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .join(UserRole, UserRole.role_id == RolePermission.role_id)
+        .where(UserRole.user_id == user_id)
+        .distinct()
+        .order_by(Permission.name)
+    )
+    return list(roles.scalars()), list(permissions.scalars())
+
+
+async def issue_access_token(db: AsyncSession, user: User) -> str:
+    """The access token login hands out, stateless or not depending on settings."""
+    if not settings.stateless_auth:
+        return create_access_token(data={"sub": user.username})
+    roles, permissions = await load_authorization(db, user.id)
+    return create_access_token(
+        data={
+            "sub": user.username,
+            "uid": user.id,
+            "active": bool(user.is_active),
+            "su": bool(user.is_superuser),
+            "roles": roles,
+            "perms": permissions,
+            "iat": int(time.time()),
+            "iat_ns": time.time_ns(),
+            "jti": uuid.uuid4().hex,
+        },
+        expires_delta=timedelta(minutes=settings.stateless_token_expire_minutes),
+    )
+
+
+# User attributes a claims-built principal carries, mapped to their claims.
+# Everything else (email, created_at, ...) is None: the principal only
+# authorizes the request and must not be returned as the user's profile.
+CLAIM_FIELDS = {
+    "id": "uid",
+    "username": "sub",
+    "is_active": "active",
+    "is_superuser": "su",
+}
+
+
+def principal_from_claims(claims: Mapping[str, Any]) -> Optional[User]:
+    """Build the request's user from a stateless token, or None if it is revoked.
+
+    Only ``CLAIM_FIELDS`` plus ``roles`` and ``permissions`` are set; endpoints
+    that return user data must load the row rather than serialize this object.
+    """
+    if is_revoked(claims):
+        return None
+    # Detached instance, like the principal cache returns: never attached to
+    # a session, so reading it cannot trigger a query.
+    user = User(**{field: claims[claim] for field, claim in CLAIM_FIELDS.items()})
+    user.roles = frozenset(claims.get("roles", ()))
+    user.permissions = frozenset(claims.get("perms", ()))
+    return user
+
+
+def is_stateless(claims: Mapping[str, Any]) -> bool:
+    return "uid" in claims
+
+
+# Embedded claims may be stale once these change, and a new password should
+# sign out other devices; make them log in again. Other columns (email, the
+# login rehash of an unchanged password) leave issued tokens valid.
+on_user_changed(
+    revoke_subject, columns=("username", "is_active", "is_superuser", "hashed_password")
+)
@@ -0,0 +1,78 @@
+"""Notify auth caches whenever a user row changes, whatever statement changed it.
+
+Mapper events only fire for objects flushed through the unit of work; the
+crud helpers issue UPDATE/DELETE statements directly, which only pass
+through the session's ``do_orm_execute`` hook. Both paths end up here and
+call every registered listener with each affected username.
+
+A listener registered with ``columns`` only hears about updates that set one
+of them (and about every delete). An UPDATE executed with the
+``password_rehash`` execution option re-encodes the same password, so it
+does not count as changing ``hashed_password``.
+"""
+from typing import Callable, Collection, Iterable, Optional
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session
+from app.models.user import User
+
+UserListener = Callable[[str], None]
+
+_listeners: list[tuple[UserListener, Optional[frozenset[str]]]] = []
+
+
+def on_user_changed(
+    listener: UserListener, columns: Optional[Collection[str]] = None
+) -> UserListener:
+    """Register ``listener`` to be called with the username of every updated or deleted user.
+
+    With ``columns``, updates that leave all of those columns alone are skipped.
+    """
+    _listeners.append((listener, None if columns is None else frozenset(columns)))
+    return listener
+
+
+def _notify(usernames: Iterable[str], changed: Optional[set[str]] = None) -> None:
+    # ``changed`` is None for deletes and for updates whose columns are unknown.
+    for username in set(usernames):
+        for listener, columns in _listeners:
+            if columns is None or changed is None or columns & changed:
+                listener(username)
+
+
+def _set_columns(state: ORMExecuteState) -> Optional[set[str]]:
+    # ``_values`` holds the SET clause of a plain ``.values()`` UPDATE; other
+    # forms (ordered or multi-row values) fall back to notifying everyone.
+    values = getattr(state.statement, "_values", None)
+    if not values:
+        return None
+    changed = {getattr(column, "key", column) for column in values}
+    if state.execution_options.get("password_rehash"):
+        changed.discard("hashed_password")
+    return changed
+
+
+@event.listens_for(User, "after_update")
+def _after_update(mapper, connection, target):
+    attrs = inspect(target).attrs
+    changed = {attr.key for attr in attrs if attr.history.has_changes()}
+    # A rename leaves the old subject behind under its previous username.
+    _notify([*attrs.username.history.deleted, target.username], changed)
+
+
+@event.listens_for(User, "after_delete")
+def _after_delete(mapper, connection, target):
+    _notify([target.username])
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _after_statement(state: ORMExecuteState):
+    if not (state.is_update or state.is_delete) or User.__mapper__ not in state.all_mappers:
+        return None
+    # The statement only names rows by its WHERE clause; look up whose they are first.
+    query = select(User.username)
+    if state.statement.whereclause is not None:
+        query = query.where(state.statement.whereclause)
+    usernames = state.session.execute(query).scalars().all()
+    result = state.invoke_statement()
+    _notify(usernames, _set_columns(state) if state.is_update else None)
+    return result
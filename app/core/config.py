@@ -1,20 +1,90 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Optional
+from datetime import time
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
     app_name: str = "Health Microservice API"
     debug: bool = False
     version: str = "1.0.0"
+    # Default JSON encoder for responses; "json" falls back to the stdlib encoder.
+    json_response: Literal["orjson", "json"] = "orjson"
 
     # Database
     database_url: str = Field(..., env="DATABASE_URL")
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Optional read replica used by GET endpoints; falls back to the primary.
+    database_read_url: Optional[str] = None
 
     # JWT
     secret_key: str = Field(..., env="SECRET_KEY")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # "pyjwt" needs the pyjwt extra; both verify the same tokens.
+    jwt_backend: Literal["jose", "pyjwt"] = "jose"
+
+    # Stateless mode: access tokens embed the user's flags, roles and
+    # permissions, and requests are authorized without reading the users table.
+    stateless_auth: bool = False
+    stateless_token_expire_minutes: int = 5
+    revocation_list_max_size: int = 100000
+
+    # Refresh tokens: rotated on every use, stored as HMACs in refresh_tokens
+    refresh_token_expire_days: int = 30
+    refresh_token_cache_max_size: int = 100000
+    # Expired rows are deleted in batches, at most once per interval per worker
+    refresh_token_purge_interval_seconds: int = 60
+    refresh_token_purge_batch_size: int = 1000
+
+    # Verified access token claims, cached until each token expires
+    token_cache_enabled: bool = True
+    token_cache_max_size: int = 10000
+
+    # Password hashing. New passwords use the first scheme; hashes in the
+    # other schemes, or below the configured cost, are upgraded on login.
+    password_schemes: list[Literal["argon2", "bcrypt"]] = ["bcrypt"]
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 4
+
+    # Password hashing worker pool; operations beyond max_waiting get a 503.
+    password_hash_workers: int = 4
+    password_hash_max_waiting: int = 64
+    password_hash_executor: Literal["thread", "process"] = "thread"
+
+    # Authenticated principal cache
+    principal_cache_enabled: bool = True
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_max_size: int = 10000
+
+    # Pagination
+    max_page_size: int = 500
+
+    # Bulk endpoints
+    bulk_max_items: int = 1000
+
+    # Wearable telemetry ingestion
+    device_ingest_max_batch: int = 50000
+    device_ingest_max_body_bytes: int = 32 * 1024 * 1024
+    device_rollup_max_buckets: int = 5000
+
+    # Appointment scheduling; clinic hours are wall-clock times in clinic_timezone.
+    max_appointment_minutes: int = 480
+    clinic_timezone: str = "UTC"
+    clinic_opens_at: time = time(9, 0)
+    clinic_closes_at: time = time(17, 0)
+    clinic_weekdays: list[int] = [0, 1, 2, 3, 4]
+    availability_slot_minutes: int = 15
+    availability_max_days: int = 31
+
+    # Streaming exports
+    export_chunk_size: int = 1000
 
     # CORS
     backend_cors_origins: list[str] = [
@@ -0,0 +1,40 @@
+from typing import Callable, Iterable, NamedTuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    documentation: str
+    type: str
+    samples: list[tuple[dict, float]]
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+_collectors: list[Collector] = []
+
+
+def register_collector(collector: Collector) -> Collector:
+    """Register a callable that reports metric families on every scrape."""
+    _collectors.append(collector)
+    return collector
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def render_metrics() -> str:
+    """Render all registered collectors in the Prometheus text exposition format."""
+    lines = []
+    for collector in _collectors:
+        for family in collector():
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for labels, value in family.samples:
+                lines.append(f"{family.name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
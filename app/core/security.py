@@ -1,11 +1,156 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
 from passlib.context import CryptContext
+from app.core.config import Settings, settings
+from app.core.metrics import MetricFamily, register_collector
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+
+def build_password_context(config: Settings = settings) -> CryptContext:
+    """CryptContext for the configured schemes and cost parameters.
+
+    The first scheme hashes new passwords and every other one is deprecated.
+    Minimum costs equal the configured ones, so hashes made with a lower cost
+    (or a deprecated scheme) report ``needs_update`` and are replaced on the
+    next successful login.
+    """
+    options = {}
+    if "bcrypt" in config.password_schemes:
+        options["bcrypt__default_rounds"] = config.bcrypt_rounds
+        options["bcrypt__min_rounds"] = config.bcrypt_rounds
+    if "argon2" in config.password_schemes:
+        options["argon2__default_rounds"] = config.argon2_time_cost
+        options["argon2__min_rounds"] = config.argon2_time_cost
+        options["argon2__memory_cost"] = config.argon2_memory_cost_kib
+        options["argon2__parallelism"] = config.argon2_parallelism
+    return CryptContext(schemes=config.password_schemes, deprecated="auto", **options)
+
+
+pwd_context = build_password_context()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify a password and, if its hash is outdated, return a replacement hash."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when too many hash operations are already waiting."""
+
+
+class PasswordHasher:
+    """Runs password hashing off the event loop in a bounded worker pool.
+
+    Each hash takes hundreds of milliseconds of CPU; awaiting it here
+    keeps the event loop serving other requests meanwhile. At most
+    ``max_workers`` operations run at once and at most ``max_waiting`` queue
+    behind them; past that, ``PasswordHasherBusy`` is raised so a login storm
+    is shed early instead of piling up. bcrypt and argon2 release the GIL, so threads
+    scale across cores; a process pool is available for hashers that do not.
+    """
+
+    def __init__(self, max_workers: int, max_waiting: int, executor: str = "thread"):
+        self.max_workers = max_workers
+        self.max_waiting = max_waiting
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.waiting = 0
+        self.completed = {"hash": 0, "verify": 0, "rehash": 0}
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.work_seconds = 0.0
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable[..., T], *args) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        if self._slots.locked() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.perf_counter()
+        self.wait_seconds += started - queued
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), func, *args)
+        finally:
+            self.running -= 1
+            self.work_seconds += time.perf_counter() - started
+            self.completed[operation] += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        valid, new_hash = await self._run(
+            "verify", verify_and_update_password, plain_password, hashed_password
+        )
+        if new_hash is not None:
+            self.completed["rehash"] += 1
+        return valid, new_hash
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_waiting=settings.password_hash_max_waiting,
+    executor=settings.password_hash_executor,
+)
+
+
+def collect_password_hasher_metrics():
+    hasher = password_hasher
+    return [
+        MetricFamily("password_hash_running", "Hash operations running in the pool.", "gauge", [({}, hasher.running)]),
+        MetricFamily("password_hash_waiting", "Hash operations waiting for a worker.", "gauge", [({}, hasher.waiting)]),
+        MetricFamily(
+            "password_hash_operations_total", "Completed hash operations.", "counter",
+            [({"operation": operation}, count) for operation, count in hasher.completed.items()],
+        ),
+        MetricFamily("password_hash_rejected_total", "Operations shed because the queue was full.", "counter", [({}, hasher.rejected)]),
+        MetricFamily("password_hash_wait_seconds_total", "Time spent waiting for a worker.", "counter", [({}, hasher.wait_seconds)]),
+        MetricFamily("password_hash_seconds_total", "Time spent hashing in workers.", "counter", [({}, hasher.work_seconds)]),
+    ]
+
+
+register_collector(collect_password_hasher_metrics)
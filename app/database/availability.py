@@ -0,0 +1,289 @@
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Mapping, Optional, Sequence
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, and_, exists, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.functions import FunctionElement
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatusEnum
+from app.utils.cache import TTLCache
+
+# Appointments in these states no longer hold their slot.
+INACTIVE_STATUSES = (AppointmentStatusEnum.CANCELLED, AppointmentStatusEnum.NO_SHOW)
+
+DEFAULT_MINUTES = Appointment.__table__.c.duration_minutes.default.arg
+
+# Postgres-only backstop against concurrent double booking; see the
+# add_appointment_overlap_constraint migration.
+EXCLUSION_CONSTRAINT = "ex_appointments_doctor_period"
+
+Interval = tuple[datetime, datetime]
+
+# Longest stored booking. Rows above max_appointment_minutes exist (booked
+# before the cap, or before the setting was lowered), so the setting alone
+# cannot bound how early an overlapping booking may start.
+_longest = TTLCache(max_size=1, ttl=300)
+
+
+class minutes_after(FunctionElement):
+    """``start + minutes`` as SQL, so appointment ends can be compared in a query."""
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(minutes_after)
+def _minutes_after(element, compiler, **kw):
+    start, minutes = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"({start} + make_interval(mins => {minutes}))"
+
+
+@compiles(minutes_after, "sqlite")
+def _minutes_after_sqlite(element, compiler, **kw):
+    # Rendered in the same text format SQLAlchemy stores SQLite datetimes in,
+    # so the result compares correctly against stored and bound values.
+    start, minutes = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"(strftime('%Y-%m-%d %H:%M:%f', {start}, ({minutes}) || ' minutes') || '000')"
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are stored as UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _interval(start: datetime, minutes: Optional[int]) -> Interval:
+    start = _utc(start)
+    return start, start + timedelta(minutes=minutes or DEFAULT_MINUTES)
+
+
+def clear_longest_booking() -> None:
+    _longest.clear()
+
+
+async def longest_booking(db: AsyncSession) -> int:
+    """Minutes of the longest booking that can exist, stored or still to be made.
+
+    The stored maximum is re-read every few minutes; new bookings are capped
+    at ``max_appointment_minutes`` and cannot raise it meanwhile.
+    """
+    stored = _longest.get("minutes")
+    if stored is None:
+        stored = await db.scalar(select(func.max(Appointment.duration_minutes))) or 0
+        _longest.set("minutes", stored)
+    return max(stored, settings.max_appointment_minutes, DEFAULT_MINUTES)
+
+
+def _minutes_before(start, minutes: int):
+    if isinstance(start, datetime):
+        return start - timedelta(minutes=minutes)
+    return minutes_after(start, -minutes)
+
+
+def _booked_between(start, end, longest: int, booking=Appointment):
+    """Active appointments overlapping ``[start, end)``.
+
+    ``start`` and ``end`` may be values or SQL expressions. The lower bound on
+    the start time is implied by the longest booking and keeps the lookup a
+    range scan of the (doctor_id, appointment_datetime) index.
+    """
+    ends = minutes_after(
+        booking.appointment_datetime,
+        func.coalesce(booking.duration_minutes, DEFAULT_MINUTES),
+    )
+    return and_(
+        booking.status.notin_(INACTIVE_STATUSES),
+        booking.appointment_datetime < end,
+        booking.appointment_datetime > _minutes_before(start, longest),
+        ends > start,
+    )
+
+
+def overlapping(
+    doctor_id: int,
+    start: datetime,
+    minutes: Optional[int],
+    *,
+    longest: int,
+    exclude_id: Optional[int] = None,
+):
+    """WHERE clause for the doctor's active appointments that overlap a booking."""
+    clause = and_(
+        Appointment.doctor_id == doctor_id,
+        _booked_between(*_interval(start, minutes), longest),
+    )
+    if exclude_id is not None:
+        clause = and_(clause, Appointment.id != exclude_id)
+    return clause
+
+
+def stays_free(changes: Mapping[str, Any], longest: int):
+    """WHERE condition failing an UPDATE of one appointment that would double book it.
+
+    Columns not in ``changes`` keep the row's own values, so the check and the
+    write are one statement. Returns None when ``changes`` cannot create an
+    overlap. A status-only change between active states keeps the same slot
+    and is always allowed.
+    """
+    if not changes.keys() & {"appointment_datetime", "duration_minutes", "status"}:
+        return None
+    if changes.get("status") in INACTIVE_STATUSES:
+        return None
+    if "appointment_datetime" in changes:
+        start = _utc(changes["appointment_datetime"])
+    else:
+        start = Appointment.appointment_datetime
+    if "duration_minutes" in changes:
+        minutes = changes["duration_minutes"] or DEFAULT_MINUTES
+    else:
+        minutes = func.coalesce(Appointment.duration_minutes, DEFAULT_MINUTES)
+    if isinstance(start, datetime) and isinstance(minutes, int):
+        end = start + timedelta(minutes=minutes)
+    else:
+        end = minutes_after(start, minutes)
+
+    other = aliased(Appointment)
+    free = ~exists().where(
+        other.doctor_id == Appointment.doctor_id,
+        other.id != Appointment.id,
+        _booked_between(start, end, longest, other),
+    )
+    if "status" not in changes:
+        # An inactive booking holds no slot, whatever its new time.
+        return or_(Appointment.status.in_(INACTIVE_STATUSES), free)
+    if changes.keys() == {"status"}:
+        return or_(Appointment.status.notin_(INACTIVE_STATUSES), free)
+    return free
+
+
+async def find_conflict(
+    db: AsyncSession,
+    doctor_id: int,
+    start: datetime,
+    minutes: Optional[int],
+    *,
+    exclude_id: Optional[int] = None,
+) -> Optional[int]:
+    """Return the id of an active appointment the booking would overlap, if any."""
+    longest = await longest_booking(db)
+    result = await db.execute(
+        select(Appointment.id)
+        .where(overlapping(doctor_id, start, minutes, longest=longest, exclude_id=exclude_id))
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def find_batch_conflicts(
+    db: AsyncSession, rows: Sequence[Mapping[str, Any]], errors: dict[int, str]
+) -> None:
+    """Add an error for every row that overlaps a booking or an earlier row of the batch.
+
+    Existing bookings for all the batch's doctors are read with one query;
+    rows already in ``errors`` are skipped and do not hold a slot.
+    """
+    pending = [index for index in range(len(rows)) if index not in errors]
+    if not pending:
+        return
+    intervals = {
+        index: _interval(rows[index]["appointment_datetime"], rows[index].get("duration_minutes"))
+        for index in pending
+    }
+    window_start = min(start for start, _ in intervals.values())
+    window_end = max(end for _, end in intervals.values())
+    result = await db.execute(
+        select(
+            Appointment.id,
+            Appointment.doctor_id,
+            Appointment.appointment_datetime,
+            Appointment.duration_minutes,
+        ).where(
+            Appointment.doctor_id.in_({rows[index]["doctor_id"] for index in pending}),
+            _booked_between(window_start, window_end, await longest_booking(db)),
+        )
+    )
+    booked: dict[int, list[tuple[Interval, str]]] = {}
+    for row in result:
+        interval = _interval(row.appointment_datetime, row.duration_minutes)
+        booked.setdefault(row.doctor_id, []).append((interval, f"appointment {row.id}"))
+    for index in pending:
+        start, end = intervals[index]
+        taken = booked.setdefault(rows[index]["doctor_id"], [])
+        clash = next((label for (s, e), label in taken if s < end and start < e), None)
+        if clash is not None:
+            errors[index] = f"Doctor is already booked by {clash}"
+        else:
+            taken.append(((start, end), f"item {index} of this batch"))
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    """True when the database rejected a write as a double booking."""
+    return EXCLUSION_CONSTRAINT in str(error.orig)
+
+
+async def busy_intervals(
+    db: AsyncSession, doctor_id: int, start: datetime, end: datetime
+) -> list[Interval]:
+    """The doctor's active bookings overlapping ``[start, end)``, merged and sorted."""
+    result = await db.execute(
+        select(Appointment.appointment_datetime, Appointment.duration_minutes)
+        .where(
+            Appointment.doctor_id == doctor_id,
+            _booked_between(start, end, await longest_booking(db)),
+        )
+        .order_by(Appointment.appointment_datetime)
+    )
+    merged: list[list[datetime]] = []
+    for booked_start, booked_end in (_interval(*row) for row in result):
+        if merged and booked_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], booked_end)
+        else:
+            merged.append([booked_start, booked_end])
+    return [(s, e) for s, e in merged]
+
+
+def clinic_hours(date_from: date, date_to: date) -> list[Interval]:
+    """Opening hours of each clinic day in ``[date_from, date_to]``, in UTC."""
+    zone = ZoneInfo(settings.clinic_timezone)
+    hours = []
+    day = date_from
+    while day <= date_to:
+        if day.weekday() in settings.clinic_weekdays:
+            opens = datetime.combine(day, settings.clinic_opens_at, tzinfo=zone)
+            closes = datetime.combine(day, settings.clinic_closes_at, tzinfo=zone)
+            hours.append((_utc(opens), _utc(closes)))
+        day += timedelta(days=1)
+    return hours
+
+
+def free_slots(
+    busy: Sequence[Interval], hours: Sequence[Interval], minutes: int, step: int
+) -> list[Interval]:
+    """Every ``minutes`` long slot inside ``hours`` that avoids ``busy``.
+
+    ``busy`` must be merged and sorted, as ``busy_intervals`` returns it. Slots
+    start on ``step`` minute boundaries from opening time, and the sweep is
+    linear in the number of bookings and slots.
+    """
+    length, stride = timedelta(minutes=minutes), timedelta(minutes=step)
+    ends = [end for _, end in busy]
+    slots = []
+    for opens, closes in hours:
+        position = bisect_left(ends, opens + timedelta.resolution)
+        cursor = opens
+        while cursor + length <= closes:
+            while position < len(busy) and busy[position][1] <= cursor:
+                position += 1
+            if position < len(busy) and busy[position][0] < cursor + length:
+                # Jump to the first step boundary after this booking ends.
+                gap = busy[position][1] - opens
+                cursor = opens + -(-gap // stride) * stride
+                continue
+            slots.append((cursor, cursor + length))
+            cursor += stride
+    return slots
@@ -0,0 +1,54 @@
+from typing import Sequence
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def supports_copy(db: AsyncSession) -> bool:
+    """COPY is only available when talking to Postgres through asyncpg."""
+    return db.get_bind().dialect.driver == "asyncpg"
+
+
+def _apply_scalar_defaults(table, rows: Sequence[dict]) -> list[dict]:
+    # COPY bypasses SQLAlchemy, so client-side column defaults must be filled in here.
+    defaults = {
+        column.key: column.default.arg
+        for column in table.columns
+        if column.default is not None and column.default.is_scalar
+    }
+    return [{**defaults, **row} for row in rows]
+
+
+async def _copy_rows(db: AsyncSession, table, rows: Sequence[dict]) -> None:
+    connection = await db.connection()
+    dialect = connection.dialect
+    columns = list(rows[0].keys())
+    processors = [
+        table.columns[name].type.bind_processor(dialect) for name in columns
+    ]
+    records = [
+        tuple(
+            process(row[name]) if process else row[name]
+            for name, process in zip(columns, processors)
+        )
+        for row in rows
+    ]
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, schema_name=table.schema, columns=columns, records=records
+    )
+
+
+async def bulk_insert(db: AsyncSession, model, rows: Sequence[dict]) -> int:
+    """Insert many rows in the session's transaction without building ORM objects.
+
+    Uses COPY on Postgres and a batched multi-row INSERT elsewhere. Every row
+    must provide the same keys. The caller is responsible for committing.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    if supports_copy(db):
+        await _copy_rows(db, table, _apply_scalar_defaults(table, rows))
+    else:
+        await db.execute(insert(table), list(rows))
+    return len(rows)
@@ -0,0 +1,197 @@
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Optional, Sequence, TypeVar
+from sqlalchemy import delete, exists, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ModelT = TypeVar("ModelT")
+
+RowCheck = Callable[[AsyncSession, Sequence[Mapping[str, Any]], dict[int, str]], Awaitable[None]]
+
+
+async def create_object(db: AsyncSession, model: type[ModelT], data: Mapping[str, Any]) -> ModelT:
+    """INSERT ... RETURNING the full row and commit, in a single round trip."""
+    result = await db.execute(insert(model).values(**data).returning(model))
+    obj = result.scalar_one()
+    await db.commit()
+    return obj
+
+
+async def create_objects(
+    db: AsyncSession, model: type[ModelT], rows: Sequence[Mapping[str, Any]]
+) -> list[ModelT]:
+    """Multi-row INSERT ... RETURNING in one transaction, results in input order."""
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(model).returning(model, sort_by_parameter_order=True), list(rows)
+    )
+    objs = list(result.scalars())
+    await db.commit()
+    return objs
+
+
+async def find_invalid_rows(
+    db: AsyncSession,
+    model: type,
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    unique: Sequence[str] = (),
+    parents: Optional[Mapping[str, type]] = None,
+) -> dict[int, str]:
+    """Check a batch against unique columns and parent rows with one query per check.
+
+    Returns an error message keyed by the index of every row that would fail.
+    """
+    errors: dict[int, str] = {}
+    for name in unique:
+        column = getattr(model, name)
+        values = {row[name] for row in rows if row.get(name) is not None}
+        taken = set()
+        if values:
+            taken = set((await db.execute(select(column).where(column.in_(values)))).scalars())
+        seen = set()
+        for index, row in enumerate(rows):
+            value = row.get(name)
+            if value is None or index in errors:
+                continue
+            if value in taken:
+                errors[index] = f"{name} '{value}' already exists"
+            elif value in seen:
+                errors[index] = f"{name} '{value}' is repeated in this batch"
+            seen.add(value)
+    for field, parent in (parents or {}).items():
+        ids = {row[field] for row in rows}
+        found = set((await db.execute(select(parent.id).where(parent.id.in_(ids)))).scalars())
+        for index, row in enumerate(rows):
+            if index not in errors and row[field] not in found:
+                errors[index] = f"{parent.__name__} not found"
+    return errors
+
+
+async def bulk_create(
+    db: AsyncSession,
+    model: type[ModelT],
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    unique: Sequence[str] = (),
+    parents: Optional[Mapping[str, type]] = None,
+    check: Optional[RowCheck] = None,
+) -> list[tuple[Optional[ModelT], Optional[str]]]:
+    """Insert every valid row of a batch and report ``(obj, error)`` per input row.
+
+    Rows that would violate a unique column or reference a missing parent are
+    skipped with an error; the rest go in with a single multi-row INSERT.
+    ``check`` runs after those checks and adds errors of its own for rows that
+    are still valid.
+    """
+    errors = await find_invalid_rows(db, model, rows, unique=unique, parents=parents)
+    if check is not None:
+        await check(db, rows, errors)
+    created = iter(
+        await create_objects(
+            db, model, [row for index, row in enumerate(rows) if index not in errors]
+        )
+    )
+    return [
+        (None, errors[index]) if index in errors else (next(created), None)
+        for index in range(len(rows))
+    ]
+
+
+async def create_with_parents(
+    db: AsyncSession,
+    model: type[ModelT],
+    data: Mapping[str, Any],
+    parents: Mapping[str, type],
+    conditions: Sequence = (),
+) -> Optional[ModelT]:
+    """INSERT a row only if every referenced parent exists, in a single statement.
+
+    ``parents`` maps foreign-key fields in ``data`` to the model they point at.
+    Renders ``INSERT ... SELECT :values WHERE EXISTS (...) AND ... RETURNING *``
+    and returns None, without committing, when any parent is missing; use
+    ``find_missing_parent`` to report which one. Any extra ``conditions`` are
+    added to the WHERE clause and fail the insert the same way.
+    """
+    table = model.__table__
+    values = select(
+        *(literal(value, table.c[key].type).label(key) for key, value in data.items())
+    ).where(
+        *(
+            exists().where(parent.id == data[field])
+            for field, parent in parents.items()
+        ),
+        *conditions,
+    )
+    result = await db.execute(
+        insert(model).from_select(list(data), values).returning(model)
+    )
+    obj = result.scalar_one_or_none()
+    if obj is not None:
+        await db.commit()
+    return obj
+
+
+async def find_missing_parent(
+    db: AsyncSession, data: Mapping[str, Any], parents: Mapping[str, type]
+) -> Optional[type]:
+    """Return the first model in ``parents`` with no row for its id in ``data``."""
+    found = (
+        await db.execute(
+            select(
+                *(
+                    exists().where(parent.id == data[field]).label(field)
+                    for field, parent in parents.items()
+                )
+            )
+        )
+    ).one()
+    for field, parent in parents.items():
+        if not getattr(found, field):
+            return parent
+    return None
+
+async def update_object(
+    db: AsyncSession,
+    model: type[ModelT],
+    ident: int,
+    data: Mapping[str, Any],
+    conditions: Sequence = (),
+) -> Optional[ModelT]:
+    """UPDATE only the given columns of one row and return it, or None if no row matched.
+
+    The row is never loaded first: the UPDATE ... RETURNING is the only statement.
+    Any extra ``conditions`` are added to the WHERE clause; a row failing them
+    is left alone and reported as None like a missing one.
+    """
+    if not data:
+        return await db.get(model, ident)
+    result = await db.execute(
+        update(model)
+        .where(model.id == ident, *conditions)
+        .values(**data)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    obj = result.scalar_one_or_none()
+    await db.commit()
+    return obj
+
+
+async def delete_object(db: AsyncSession, model: type, ident: int) -> bool:
+    """DELETE one row by id without loading it. Returns False if no row matched."""
+    result = await db.execute(
+        delete(model).where(model.id == ident).returning(model.id)
+    )
+    deleted = result.scalar_one_or_none() is not None
+    await db.commit()
+    return deleted
+
+
+async def delete_objects(db: AsyncSession, model: type, ids: Iterable[int]) -> list[int]:
+    """DELETE every row whose id is in ``ids`` with one statement and return the ids removed."""
+    result = await db.execute(
+        delete(model).where(model.id.in_(set(ids))).returning(model.id)
+    )
+    deleted = sorted(result.scalars().all())
+    await db.commit()
+    return deleted
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.device import DeviceDataRollup
+
+RESOLUTIONS = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def bucket_start(recorded_at: datetime, resolution: str) -> datetime:
+    """Truncate a timestamp to the start of its UTC bucket."""
+    if recorded_at.tzinfo is None:
+        recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+    width = RESOLUTIONS[resolution]
+    return _EPOCH + (recorded_at - _EPOCH) // width * width
+
+
+def aggregate_readings(readings: Iterable[dict]) -> list[dict]:
+    """Fold raw readings into one rollup row per (device, type, resolution, bucket)."""
+    buckets: dict[tuple, list] = {}
+    for reading in readings:
+        value = reading.get("value")
+        if value is None:
+            continue
+        for resolution in RESOLUTIONS:
+            key = (
+                reading["device_id"],
+                reading["data_type"],
+                resolution,
+                bucket_start(reading["recorded_at"], resolution),
+            )
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [1, value, value, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+    # Sorted so concurrent ingesters lock rollup rows in the same order.
+    return [
+        {
+            "device_id": device_id,
+            "data_type": data_type,
+            "resolution": resolution,
+            "bucket_start": start,
+            "count": count,
+            "sum": total,
+            "min": low,
+            "max": high,
+        }
+        for (device_id, data_type, resolution, start), (count, total, low, high) in sorted(
+            buckets.items()
+        )
+    ]
+
+
+async def update_rollups(db: AsyncSession, readings: Iterable[dict]) -> int:
+    """Merge a batch of raw readings into the rollup table within the caller's transaction."""
+    rows = aggregate_readings(readings)
+    if not rows:
+        return 0
+    upsert = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    table = DeviceDataRollup.__table__
+    stmt = upsert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["device_id", "data_type", "resolution", "bucket_start"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            "sum": table.c.sum + stmt.excluded.sum,
+            "min": case(
+                (stmt.excluded.min < table.c.min, stmt.excluded.min),
+                else_=table.c.min,
+            ),
+            "max": case(
+                (stmt.excluded.max > table.c.max, stmt.excluded.max),
+                else_=table.c.max,
+            ),
+        },
+    )
+    await db.execute(stmt, rows)
+    return len(rows)
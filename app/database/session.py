@@ -1,10 +1,109 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import MetricFamily, register_collector
 
-engine = create_async_engine(settings.database_url, echo=settings.debug, future=True)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        # Only successful checkouts count; timeouts have their own counter.
+        self.checkouts += 1
+        return connection
+
+    def recreate(self):
+        # Keep the counters across pool recreation (e.g. after engine.dispose()).
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_seconds = self.wait_seconds
+        pool.max_wait_seconds = self.max_wait_seconds
+        return pool
+
+
+def engine_options(database_url: str) -> dict:
+    options = {"echo": settings.debug, "future": True}
+    if make_url(database_url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool implementation; sizing options don't apply.
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+engine = create_async_engine(settings.database_url, **engine_options(settings.database_url))
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+if settings.database_read_url:
+    read_engine = create_async_engine(
+        settings.database_read_url, **engine_options(settings.database_read_url)
+    )
+else:
+    read_engine = engine
+
+async_read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+_pooled_engines = {"primary": engine}
+if read_engine is not engine:
+    _pooled_engines["replica"] = read_engine
+
+
+def collect_pool_metrics():
+    pools = {
+        name: pooled.pool
+        for name, pooled in _pooled_engines.items()
+        if isinstance(pooled.pool, InstrumentedQueuePool)
+    }
+    if not pools:
+        return []
+
+    def family(name, documentation, metric_type, value):
+        samples = [({"engine": key}, value(pool)) for key, pool in pools.items()]
+        return MetricFamily(name, documentation, metric_type, samples)
+
+    return [
+        family("db_pool_size", "Configured pool size.", "gauge", lambda p: p.size()),
+        family("db_pool_checked_out", "Connections currently checked out.", "gauge", lambda p: p.checkedout()),
+        family("db_pool_overflow", "Connections open beyond pool_size.", "gauge", lambda p: max(p.overflow(), 0)),
+        family("db_pool_checkouts_total", "Connection checkouts.", "counter", lambda p: p.checkouts),
+        family("db_pool_timeouts_total", "Checkouts that hit pool_timeout.", "counter", lambda p: p.timeouts),
+        family("db_pool_wait_seconds_total", "Time spent waiting for a connection.", "counter", lambda p: p.wait_seconds),
+        family("db_pool_max_wait_seconds", "Longest single checkout wait.", "gauge", lambda p: p.max_wait_seconds),
+    ]
+
+
+register_collector(collect_pool_metrics)
+
 
 async def get_async_session() -> AsyncSession:
     async with async_session() as session:
@@ -12,3 +111,16 @@ async def get_async_session() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_session() -> AsyncSession:
+    """Session bound to the read replica, for handlers that never write.
+
+    Replicas lag the primary, so anything that must observe its own writes
+    (including the response of a create/update) should use get_async_session.
+    """
+    async with async_read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
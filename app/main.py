@@ -1,6 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi_mcp import FastApiMCP
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.core.security import PasswordHasherBusy
 from app.middlewares.cors import add_cors_middleware
 from app.api.routes import (
     auth,
@@ -13,12 +16,16 @@ from app.api.routes import (
     referral,
     pharmacy,
     insurance,
+    devices,
 )
 
+RESPONSE_CLASSES = {"orjson": ORJSONResponse, "json": JSONResponse}
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="A comprehensive health microservice API with JWT authentication",
+    default_response_class=RESPONSE_CLASSES[settings.json_response],
 )
 
 # Add CORS middleware
@@ -35,6 +42,16 @@ app.include_router(lab.router)
 app.include_router(referral.router)
 app.include_router(pharmacy.router)
 app.include_router(insurance.router)
+app.include_router(devices.router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many authentication requests, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/")
@@ -46,6 +63,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "version": settings.version}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
 # Create an MCP server based on this app
 mcp = FastApiMCP(app)
 
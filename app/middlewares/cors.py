@@ -1,5 +1,6 @@
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER
 
 
 def add_cors_middleware(app):
@@ -9,4 +10,5 @@ def add_cors_middleware(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
@@ -8,11 +8,13 @@ from app.models.lab import LabOrder, LabResult, DiagnosticImage
 from app.models.referral import ReferralRequest, ReferralStatus, SpecialistNote
 from app.models.pharmacy import Prescription, Medication, PharmacyOrder
 from app.models.insurance import InsurancePlan, InsuranceClaim, Payment, Invoice
-from app.models.device import WearableDevice, DeviceData, RemoteMonitoringLog
+from app.models.device import WearableDevice, DeviceData, DeviceDataRollup, RemoteMonitoringLog
 from app.models.portal import Message, EducationalResource, Feedback, Survey
-from app.models.role import Role
+from app.models.role import Role, Permission, UserRole, RolePermission
 from app.models.consent import ConsentForm, ConsentHistory
 from app.models.notification import Notification
+from app.models.refresh_token import RefreshToken
+from app.models.import_checkpoint import ImportCheckpoint
 
 __all__ = [
     "User",
@@ -38,13 +40,19 @@ __all__ = [
     "Invoice",
     "WearableDevice",
     "DeviceData",
+    "DeviceDataRollup",
     "RemoteMonitoringLog",
     "Message",
     "EducationalResource",
     "Feedback",
     "Survey",
     "Role",
+    "Permission",
+    "UserRole",
+    "RolePermission",
     "ConsentForm",
     "ConsentHistory",
     "Notification",
+    "RefreshToken",
+    "ImportCheckpoint",
 ]
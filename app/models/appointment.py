@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -16,6 +16,12 @@ class AppointmentStatusEnum(enum.Enum):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    # On Postgres, overlapping active bookings of a doctor are also excluded
+    # by the ex_appointments_doctor_period constraint (migration only).
+    __table_args__ = (
+        Index("ix_appointments_patient_id_appointment_datetime", "patient_id", "appointment_datetime"),
+        Index("ix_appointments_doctor_id_appointment_datetime", "doctor_id", "appointment_datetime"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -14,6 +14,9 @@ class WearableDevice(Base):
 
 class DeviceData(Base):
     __tablename__ = "device_data"
+    __table_args__ = (
+        Index("ix_device_data_device_id_recorded_at", "device_id", "recorded_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     device_id = Column(Integer, ForeignKey("wearable_devices.id"), nullable=False)
     data_type = Column(String(100), nullable=False)
@@ -21,6 +24,25 @@ class DeviceData(Base):
     unit = Column(String(20))
     recorded_at = Column(DateTime(timezone=True), nullable=False)
 
+class DeviceDataRollup(Base):
+    """Precomputed per-bucket aggregates of DeviceData, maintained on ingestion."""
+    __tablename__ = "device_data_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "device_id", "data_type", "resolution", "bucket_start",
+            name="uq_device_data_rollups_bucket",
+        ),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    device_id = Column(Integer, ForeignKey("wearable_devices.id"), nullable=False)
+    data_type = Column(String(100), nullable=False)
+    resolution = Column(String(8), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    count = Column(Integer, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
 class RemoteMonitoringLog(Base):
     __tablename__ = "remote_monitoring_logs"
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class ImportCheckpoint(Base):
+    """Progress of a named bulk import, written in the same transaction as each chunk."""
+    __tablename__ = "import_checkpoints"
+
+    name = Column(String(255), primary_key=True)
+    table_name = Column(String(64), nullable=False)
+    source = Column(String(1024), nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    imported = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -15,6 +15,9 @@ class InsurancePlan(Base):
 
 class InsuranceClaim(Base):
     __tablename__ = "insurance_claims"
+    __table_args__ = (
+        Index("ix_insurance_claims_patient_id_status", "patient_id", "status"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     plan_id = Column(Integer, ForeignKey("insurance_plans.id"), nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
 
 class LabOrder(Base):
     __tablename__ = "lab_orders"
+    __table_args__ = (
+        Index("ix_lab_orders_patient_id_order_date", "patient_id", "order_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     doctor_id = Column(Integer, ForeignKey("doctors.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -6,6 +6,10 @@ from app.database.base import Base
 
 class MedicalRecord(Base):
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index("ix_medical_records_patient_id_visit_date", "patient_id", "visit_date"),
+        Index("ix_medical_records_doctor_id_visit_date", "doctor_id", "visit_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
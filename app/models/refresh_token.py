@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class RefreshToken(Base):
+    """One issued refresh token, stored as an HMAC of its value.
+
+    Tokens issued by rotating each other share a ``family_id``; presenting an
+    already rotated token revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)
+    # Indexed for the periodic purge of expired tokens.
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
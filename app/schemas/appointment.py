@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from app.core.config import settings
 from app.models.appointment import AppointmentStatusEnum
+from app.schemas.doctor import DoctorResponse
+from app.schemas.patient import PatientResponse
 
 
 class AppointmentBase(BaseModel):
@@ -18,12 +21,13 @@ class AppointmentBase(BaseModel):
 
 
 class AppointmentCreate(AppointmentBase):
-    pass
+    # Capped on input only: stored rows may predate the cap or a lower setting.
+    duration_minutes: Optional[int] = Field(30, gt=0, le=settings.max_appointment_minutes)
 
 
 class AppointmentUpdate(BaseModel):
     appointment_datetime: Optional[datetime] = None
-    duration_minutes: Optional[int] = None
+    duration_minutes: Optional[int] = Field(None, gt=0, le=settings.max_appointment_minutes)
     status: Optional[AppointmentStatusEnum] = None
     reason: Optional[str] = None
     notes: Optional[str] = None
@@ -33,6 +37,10 @@ class AppointmentUpdate(BaseModel):
     follow_up_required: Optional[bool] = None
 
 
+class AppointmentStatusUpdate(BaseModel):
+    status: AppointmentStatusEnum
+
+
 class AppointmentResponse(AppointmentBase):
     id: int
     status: AppointmentStatusEnum
@@ -41,3 +49,19 @@ class AppointmentResponse(AppointmentBase):
 
     class Config:
         from_attributes = True
+
+
+class AppointmentExpandedResponse(AppointmentResponse):
+    patient: Optional[PatientResponse] = None
+    doctor: Optional[DoctorResponse] = None
+
+
+class TimeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class DoctorAvailabilityResponse(BaseModel):
+    doctor_id: int
+    duration_minutes: int
+    slots: List[TimeSlot]
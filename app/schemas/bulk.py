@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.bulk_max_items)
+
+
+class BulkDeleteResponse(BaseModel):
+    deleted: List[int]
+    not_found: List[int]
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+    @classmethod
+    def from_results(cls, results: Sequence[Tuple[Optional[object], Optional[str]]]):
+        items = [
+            BulkItemResult(index=index, id=obj.id if obj is not None else None, error=error)
+            for index, (obj, error) in enumerate(results)
+        ]
+        failed = sum(1 for item in items if item.error is not None)
+        return cls(created=len(items) - failed, failed=failed, results=items)
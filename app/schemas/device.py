@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 class WearableDeviceBase(BaseModel):
     user_id: int
@@ -44,4 +44,19 @@ class RemoteMonitoringLogCreate(RemoteMonitoringLogBase):
 class RemoteMonitoringLogResponse(RemoteMonitoringLogBase):
     id: int
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class DeviceDataIngestResponse(BaseModel):
+    ingested: int
+
+class DeviceDataRollupResponse(BaseModel):
+    device_id: int
+    data_type: str
+    resolution: Literal["1m", "1h", "1d"]
+    bucket_start: datetime
+    count: int
+    min: float
+    max: float
+    avg: float
+    class Config:
+        from_attributes = True
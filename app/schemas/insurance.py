@@ -28,6 +28,9 @@ class InsuranceClaimBase(BaseModel):
 class InsuranceClaimCreate(InsuranceClaimBase):
     pass
 
+class InsuranceClaimStatusUpdate(BaseModel):
+    status: str
+
 class InsuranceClaimResponse(InsuranceClaimBase):
     id: int
     created_at: datetime
@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
+from app.schemas.doctor import DoctorResponse
+from app.schemas.patient import PatientResponse
 
 
 class MedicalRecordBase(BaseModel):
@@ -53,3 +55,8 @@ class MedicalRecordResponse(MedicalRecordBase):
 
     class Config:
         from_attributes = True
+
+
+class MedicalRecordExpandedResponse(MedicalRecordResponse):
+    patient: Optional[PatientResponse] = None
+    doctor: Optional[DoctorResponse] = None
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """Minimal key/value interface shared by in-process and shared caches."""
+
+    def get(self, key: Hashable) -> Optional[Any]: ...
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheFull(Exception):
+    """A non-evicting store has no room for another key."""
+
+
+class ExpiringStore(TTLCache):
+    """Bounded in-process store that only ever drops entries once they expire.
+
+    For data that must not be forgotten early, such as revocations: when no
+    expired entry can be purged to make room, ``set`` raises ``CacheFull``
+    instead of evicting a live entry, so the caller can fail closed.
+    """
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_size:
+                for stale in [k for k, (_, at) in self._data.items() if at <= now]:
+                    del self._data[stale]
+                if len(self._data) >= self.max_size:
+                    raise CacheFull()
+            self._data[key] = (value, expires_at)
@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from typing_extensions import TypedDict
+
+_SCALARS = (bool, int, float)
+
+
+def _scalar_coercion(column, annotation):
+    """Return the scalar type a column's values must be cast to, if any.
+
+    Validation would coerce e.g. an Integer column declared ``bool`` in the
+    schema (0 -> false); plain-row serialization has to do the same by hand.
+    """
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if annotation not in _SCALARS:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return annotation
+    return None if python_type is annotation else annotation
+
+
+class RowSerializer:
+    """Renders plain rows with a response schema's JSON rules, without building models.
+
+    ``select()`` reads only the schema's columns, so list endpoints get
+    lightweight Row tuples instead of ORM objects. ``render`` then dumps them
+    through a TypeAdapter over a TypedDict mirror of the schema, compiled once,
+    which skips per-row model construction and validation; the output matches
+    what ``response_model`` would produce for the same rows. ``only()`` returns
+    a serializer narrowed to a subset of the fields, for sparse fieldsets.
+    """
+
+    def __init__(self, model, schema: type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.model = model
+        self.schema = schema
+        self.fields = list(fields or schema.model_fields)
+        table = model.__table__
+        annotations = {name: schema.model_fields[name].annotation for name in self.fields}
+        self._casts = {}
+        for name, annotation in annotations.items():
+            cast = _scalar_coercion(table.c[name], annotation)
+            if cast is not None:
+                self._casts[name] = cast
+        row_type = TypedDict(f"{schema.__name__}Row", annotations)
+        self._adapter = TypeAdapter(List[row_type])
+        self.only = lru_cache(maxsize=64)(self._only)
+
+    def _only(self, names: frozenset) -> "RowSerializer":
+        # ``id`` is always kept: keyset pagination reads it from the last row.
+        fields = [name for name in self.fields if name in names or name == "id"]
+        return RowSerializer(self.model, self.schema, fields)
+
+    def select(self):
+        table = self.model.__table__
+        return select(*(table.c[name] for name in self.fields))
+
+    def dump_json(self, rows: Sequence) -> bytes:
+        items = [row._asdict() for row in rows]
+        if self._casts:
+            for item in items:
+                for name, cast in self._casts.items():
+                    if item[name] is not None:
+                        item[name] = cast(item[name])
+        return self._adapter.dump_json(items)
+
+    def render(self, rows: Sequence) -> Response:
+        return Response(content=self.dump_json(rows), media_type="application/json")
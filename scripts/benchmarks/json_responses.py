@@ -0,0 +1,79 @@
+"""Latency of a large JSON list response under JSONResponse vs ORJSONResponse.
+
+Serves the same ``response_model=List[AppointmentResponse]`` page through a
+FastAPI app built with each ``default_response_class`` and times full requests
+over ASGI, so validation, encoding and transport are all included.
+
+    python -m scripts.benchmarks.json_responses --page-size 500 --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.models.appointment import AppointmentStatusEnum
+from app.schemas.appointment import AppointmentResponse
+
+
+def build_app(response_class, page: list) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/appointments", response_model=List[AppointmentResponse])
+    async def list_appointments():
+        return page
+
+    return app
+
+
+def make_page(size: int) -> list:
+    start = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    return [
+        AppointmentResponse(
+            id=index,
+            patient_id=index % 50 + 1,
+            doctor_id=index % 7 + 1,
+            appointment_datetime=start + timedelta(minutes=30 * index),
+            duration_minutes=30,
+            reason="Routine checkup",
+            notes="Patient requested a morning slot",
+            status=AppointmentStatusEnum.SCHEDULED,
+            created_at=start,
+        )
+        for index in range(size)
+    ]
+
+
+async def run(args) -> None:
+    page = make_page(args.page_size)
+    print(f"{'response class':<16}{'ms/request':>12}")
+    for response_class in (JSONResponse, ORJSONResponse):
+        transport = ASGITransport(app=build_app(response_class, page))
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(10):
+                await client.get("/appointments")
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                response = await client.get("/appointments")
+            elapsed = time.perf_counter() - started
+        assert len(response.json()) == args.page_size
+        print(f"{response_class.__name__:<16}{elapsed * 1000 / args.iterations:>12.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Access tokens verified per second, per JWT backend, with and without the claims cache.
+
+Uncached rows run a full decode (signature, JSON parse, claim checks) for every
+call, as ``verify_token`` did before. The cached row verifies a pool of
+``--tokens`` distinct tokens round-robin, so after the first pass each call is a
+cache hit, as when a client reuses its token for the token's lifetime.
+
+    python -m scripts.benchmarks.jwt_verify --iterations 50000 --tokens 100
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.auth import jwt_handler
+from app.auth.jwt_handler import JWT_BACKENDS, create_access_token, set_jwt_backend, verify_token
+from app.core.config import settings
+
+
+def rate(verify, tokens: list[str], iterations: int) -> float:
+    started = time.perf_counter()
+    for index in range(iterations):
+        assert verify(tokens[index % len(tokens)]) is not None
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"user{index}"}) for index in range(args.tokens)]
+    key, algorithms = settings.secret_key, [settings.algorithm]
+
+    print(f"{'path':<24}{'tokens/s':>14}")
+    for name, backend_class in JWT_BACKENDS.items():
+        try:
+            backend = backend_class()
+        except ImportError:
+            print(f"{name + ' (uncached)':<24}{'not installed':>14}")
+            continue
+        per_second = rate(lambda token, backend=backend: backend.decode(token, key, algorithms), tokens, args.iterations)
+        print(f"{name + ' (uncached)':<24}{per_second:>14,.0f}")
+
+        set_jwt_backend(backend)
+        per_second = rate(verify_token, tokens, args.iterations)
+        print(f"{name + ' (cached)':<24}{per_second:>14,.0f}")
+        jwt_handler.clear_token_cache()
+
+
+if __name__ == "__main__":
+    main()
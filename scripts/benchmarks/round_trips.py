@@ -0,0 +1,126 @@
+"""Round trips per create for appointments and medical records.
+
+Compares the previous handler shape (SELECT patient, SELECT doctor, INSERT)
+with the single ``INSERT ... SELECT ... WHERE EXISTS`` used now. Each statement
+can be charged a simulated network round trip so the SQLite default shows the
+latency a remote Postgres would add.
+
+    python -m scripts.benchmarks.round_trips --iterations 500 --rtt-ms 0.5
+    python -m scripts.benchmarks.round_trips --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+from app.database.crud import create_object, create_with_parents
+from app.models import Appointment, Doctor, MedicalRecord, Patient
+from app.models.patient import GenderEnum
+
+
+async def legacy_create(db: AsyncSession, model, data):
+    for parent, field in ((Patient, "patient_id"), (Doctor, "doctor_id")):
+        found = await db.execute(select(parent).where(parent.id == data[field]))
+        if not found.scalar_one_or_none():
+            raise LookupError(parent.__name__)
+    return await create_object(db, model, data)
+
+
+async def combined_create(db: AsyncSession, model, data):
+    parents = {"patient_id": Patient, "doctor_id": Doctor}
+    obj = await create_with_parents(db, model, data, parents)
+    if obj is None:
+        raise LookupError(model.__name__)
+    return obj
+
+
+def payload(model, patient_id: int, doctor_id: int) -> dict:
+    if model is Appointment:
+        return {
+            "patient_id": patient_id,
+            "doctor_id": doctor_id,
+            "appointment_datetime": datetime.now(timezone.utc),
+            "reason": "benchmark",
+        }
+    return {
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+        "visit_date": datetime.now(timezone.utc),
+        "diagnosis": "benchmark",
+    }
+
+
+async def run(args) -> None:
+    options = {}
+    if args.database_url.startswith("sqlite"):
+        options = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_async_engine(args.database_url, **options)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements = 0
+
+    def charge_round_trip(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        tag = uuid4().hex[:12]
+        patient = await create_object(db, Patient, {
+            "first_name": "Bench", "last_name": "Patient", "email": f"{tag}@patients.test",
+            "date_of_birth": date(1990, 1, 1), "gender": GenderEnum.OTHER,
+        })
+        doctor = await create_object(db, Doctor, {
+            "first_name": "Bench", "last_name": "Doctor", "email": f"{tag}@doctors.test",
+            "specialization": "General", "license_number": f"BENCH-{tag}",
+        })
+
+    event.listen(engine.sync_engine, "before_cursor_execute", charge_round_trip)
+    print(f"{'table':<16}{'strategy':<10}{'stmts/req':>10}{'ms/req':>10}")
+    for model in (Appointment, MedicalRecord):
+        for name, create in (("legacy", legacy_create), ("combined", combined_create)):
+            statements = 0
+            started = time.perf_counter()
+            async with sessions() as db:
+                for _ in range(args.iterations):
+                    await create(db, model, payload(model, patient.id, doctor.id))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{model.__tablename__:<16}{name:<10}"
+                f"{statements / args.iterations:>10.2f}"
+                f"{elapsed * 1000 / args.iterations:>10.3f}"
+            )
+    event.remove(engine.sync_engine, "before_cursor_execute", charge_round_trip)
+
+    if args.database_url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=0.5,
+        help="Simulated network latency charged per statement",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
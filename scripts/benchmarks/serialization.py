@@ -0,0 +1,130 @@
+"""Cost of rendering a list page of medical records, ORM + response_model vs plain rows.
+
+The legacy path loads ORM objects and validates them into
+``List[MedicalRecordResponse]`` with ``from_attributes`` before JSON encoding,
+as FastAPI does for ``response_model``. The fast path selects the schema's
+columns and dumps the rows with ``RowSerializer``. Both the query and the
+serialization are timed, and serialization is also reported on its own.
+
+    python -m scripts.benchmarks.serialization --page-size 100 --iterations 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+from app.database.bulk import bulk_insert
+from app.database.crud import create_object
+from app.models import Doctor, MedicalRecord, Patient
+from app.models.patient import GenderEnum
+from app.schemas.medical_record import MedicalRecordResponse
+from app.utils.serialization import RowSerializer
+
+response_list = TypeAdapter(List[MedicalRecordResponse])
+record_rows = RowSerializer(MedicalRecord, MedicalRecordResponse)
+
+
+def legacy_render(objs) -> bytes:
+    items = response_list.validate_python(objs, from_attributes=True)
+    return json.dumps(response_list.dump_python(items, mode="json")).encode()
+
+
+def fast_render(rows) -> bytes:
+    return record_rows.dump_json(rows)
+
+
+async def seed(sessions, count: int) -> None:
+    async with sessions() as db:
+        patient = await create_object(db, Patient, {
+            "first_name": "Bench", "last_name": "Patient",
+            "date_of_birth": date(1990, 1, 1), "gender": GenderEnum.OTHER,
+        })
+        doctor = await create_object(db, Doctor, {
+            "first_name": "Bench", "last_name": "Doctor", "email": "bench@doctors.test",
+            "specialization": "General", "license_number": "BENCH-1",
+        })
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        await bulk_insert(db, MedicalRecord, [
+            {
+                "patient_id": patient.id, "doctor_id": doctor.id,
+                "visit_date": start + timedelta(hours=index),
+                "diagnosis": "Seasonal allergies", "symptoms": "Sneezing, itchy eyes",
+                "treatment": "Antihistamines", "prescription": "Cetirizine 10mg",
+                "notes": "Follow up in two weeks", "blood_pressure_systolic": 120,
+                "blood_pressure_diastolic": 80, "heart_rate": 70, "temperature": 36.8,
+                "weight": 72.5, "height": 178.0, "record_type": "visit", "version": 1,
+            }
+            for index in range(count)
+        ])
+        await db.commit()
+
+
+async def run(args) -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await seed(sessions, args.page_size)
+
+    legacy_query = select(MedicalRecord).order_by(MedicalRecord.id).limit(args.page_size)
+    fast_query = record_rows.select().order_by(MedicalRecord.id).limit(args.page_size)
+
+    async with sessions() as db:
+        objs = (await db.execute(legacy_query)).scalars().all()
+        rows = (await db.execute(fast_query)).all()
+    assert json.loads(legacy_render(objs)) == json.loads(fast_render(rows))
+
+    async def legacy_page(db):
+        # A fresh session per page, as each request gets one.
+        return legacy_render((await db.execute(legacy_query)).scalars().all())
+
+    async def fast_page(db):
+        return fast_render((await db.execute(fast_query)).all())
+
+    print(f"{'path':<8}{'query+render ms':>17}{'render ms':>12}")
+    for name, page, render, data in (
+        ("legacy", legacy_page, legacy_render, objs),
+        ("fast", fast_page, fast_render, rows),
+    ):
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            async with sessions() as db:
+                await page(db)
+        total = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            render(data)
+        rendering = time.perf_counter() - started
+        print(
+            f"{name:<8}{total * 1000 / args.iterations:>17.3f}"
+            f"{rendering * 1000 / args.iterations:>12.3f}"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=300)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Stream CSV or NDJSON exports into the database for historical migrations.
+
+Records are read lazily, validated with the table's ``*Create`` schema and
+loaded in chunks through ``bulk_insert`` (COPY on Postgres, multi-row INSERT
+elsewhere), so memory stays bounded by ``--chunk-size``. With ``--checkpoint
+NAME`` every chunk advances a row in ``import_checkpoints`` in the same
+transaction as its inserts, so a chunk is either committed and recorded or
+neither; rerunning the same command after an interruption skips exactly the
+records that were already committed.
+
+Rows that fail validation are counted and, with ``--rejects``, written out as
+NDJSON for later repair. They are written before their chunk commits, so a
+chunk interrupted mid-way may list its rejects twice, but never loses them. A
+chunk the database refuses (e.g. an unknown patient_id) stops the import with
+the checkpoint left at the start of that chunk.
+
+    python -m scripts.bulk_import patients patients.csv
+    python -m scripts.bulk_import lab_results results.ndjson --chunk-size 20000 \\
+        --checkpoint results-2024 --rejects results.rejects.ndjson
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.bulk import bulk_insert
+from app.models import (
+    Appointment,
+    ImportCheckpoint,
+    InsuranceClaim,
+    LabResult,
+    MedicalRecord,
+    Patient,
+)
+from app.schemas.appointment import AppointmentCreate
+from app.schemas.insurance import InsuranceClaimCreate
+from app.schemas.lab import LabResultCreate
+from app.schemas.medical_record import MedicalRecordCreate
+from app.schemas.patient import PatientCreate
+
+TARGETS: dict[str, tuple[type, type[BaseModel]]] = {
+    "patients": (Patient, PatientCreate),
+    "appointments": (Appointment, AppointmentCreate),
+    "medical_records": (MedicalRecord, MedicalRecordCreate),
+    "lab_results": (LabResult, LabResultCreate),
+    "insurance_claims": (InsuranceClaim, InsuranceClaimCreate),
+}
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def detect_format(path: Path) -> str:
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Cannot tell the format of {path.name}; pass --format")
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Any]:
+    """Yield one raw record per CSV row or non-blank NDJSON line."""
+    if fmt == "csv":
+        # CSV has no null; an empty cell means the optional field is absent.
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if value != ""}
+    else:
+        for line in stream:
+            if line.strip():
+                yield line
+
+
+def validate(schema: type[BaseModel], record: Any) -> dict:
+    if isinstance(record, str):
+        return schema.model_validate_json(record).model_dump()
+    return schema.model_validate(record).model_dump()
+
+
+async def load_checkpoint(
+    sessions: async_sessionmaker, name: Optional[str], table: str, source: Path
+) -> dict:
+    state = {
+        "table": table,
+        "source": str(source.resolve()),
+        "position": 0,
+        "imported": 0,
+        "rejected": 0,
+    }
+    if name is None:
+        return state
+    async with sessions() as db:
+        saved = await db.get(ImportCheckpoint, name)
+    if saved is None:
+        return state
+    if (saved.table_name, saved.source) != (table, state["source"]):
+        raise ValueError(
+            f"Checkpoint {name} belongs to {saved.table_name} from {saved.source}"
+        )
+    return {
+        **state,
+        "position": saved.position,
+        "imported": saved.imported,
+        "rejected": saved.rejected,
+    }
+
+
+async def save_checkpoint(db: AsyncSession, name: Optional[str], state: dict) -> None:
+    """Stage ``state`` in ``db``'s transaction so it commits together with the chunk."""
+    if name is None:
+        return
+    await db.merge(
+        ImportCheckpoint(
+            name=name,
+            table_name=state["table"],
+            source=state["source"],
+            position=state["position"],
+            imported=state["imported"],
+            rejected=state["rejected"],
+        )
+    )
+
+
+async def import_file(
+    sessions: async_sessionmaker,
+    table: str,
+    source: Path,
+    *,
+    fmt: Optional[str] = None,
+    chunk_size: int = 5000,
+    checkpoint: Optional[str] = None,
+    rejects: Optional[TextIO] = None,
+    progress: Optional[TextIO] = None,
+) -> dict:
+    """Import ``source`` into ``table`` and return the final checkpoint state."""
+    model, schema = TARGETS[table]
+    fmt = fmt or detect_format(source)
+    state = await load_checkpoint(sessions, checkpoint, table, source)
+    started = time.perf_counter()
+    resumed_at = state["position"]
+
+    with source.open(newline="", encoding="utf-8") as stream:
+        records = enumerate(read_records(stream, fmt), start=1)
+        for _ in islice(records, state["position"]):
+            pass
+        while chunk := list(islice(records, chunk_size)):
+            rows, rejected = [], []
+            for number, record in chunk:
+                try:
+                    rows.append(validate(schema, record))
+                except ValidationError as exc:
+                    errors = exc.errors(
+                        include_url=False, include_context=False, include_input=False
+                    )
+                    reject = {"record": number, "errors": errors}
+                    rejected.append(json.dumps(reject, default=str) + "\n")
+            if rejects is not None and rejected:
+                rejects.writelines(rejected)
+            advanced = {
+                **state,
+                "position": chunk[-1][0],
+                "imported": state["imported"] + len(rows),
+                "rejected": state["rejected"] + len(rejected),
+            }
+            async with sessions() as db:
+                await bulk_insert(db, model, rows)
+                await save_checkpoint(db, checkpoint, advanced)
+                await db.commit()
+            state = advanced
+            if progress is not None:
+                rate = (state["position"] - resumed_at) / max(time.perf_counter() - started, 1e-9)
+                progress.write(
+                    f"{table}: {state['position']} read, {state['imported']} imported, "
+                    f"{state['rejected']} rejected ({rate:,.0f} records/s)\n"
+                )
+                progress.flush()
+    return state
+
+
+async def run(args) -> None:
+    engine = create_async_engine(args.database_url)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rejects = open(args.rejects, "a", encoding="utf-8") if args.rejects else None
+    try:
+        state = await import_file(
+            sessions,
+            args.table,
+            args.source,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            checkpoint=args.checkpoint,
+            rejects=rejects,
+            progress=sys.stderr,
+        )
+    finally:
+        if rejects is not None:
+            rejects.close()
+        await engine.dispose()
+    print(f"{state['imported']} imported, {state['rejected']} rejected")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=sorted(TARGETS))
+    parser.add_argument("source", type=Path)
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument(
+        "--checkpoint",
+        help="Name under which committed progress is recorded; reused to resume an interrupted import",
+    )
+    parser.add_argument("--rejects", help="Append rows that fail validation to this NDJSON file")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Pick password hash cost parameters that meet a latency budget on this machine.
+
+Hashes a sample password at increasing cost, with ``--concurrency`` hashes in
+flight at once as the login worker pool runs them, and reports the highest cost
+whose p99 stays within ``--target-ms``. Verifying costs the same as hashing, so
+the figure is also the CPU a login spends on the password. Run it on the
+deployment hardware and copy the printed settings into ``.env``; existing hashes
+are upgraded to the new cost as users log in.
+
+    python -m scripts.calibrate_password_hash bcrypt --target-ms 250
+    python -m scripts.calibrate_password_hash argon2 --target-ms 250 --memory-kib 65536
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterator
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "calibration")
+
+from passlib.exc import MissingBackendError
+from passlib.hash import argon2, bcrypt
+
+from app.core.config import settings
+
+PASSWORD = "calibration-password"
+
+# Past these a single hash takes seconds on any current CPU; a machine that
+# still fits the budget should be re-run with a larger --max-cost on purpose.
+MAX_COST = {"bcrypt": 16, "argon2": 16}
+
+
+def p99_ms(hash_once: Callable[[], str], samples: int, concurrency: int) -> float:
+    def timed(_) -> float:
+        started = time.perf_counter()
+        hash_once()
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(timed, range(samples)))
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def bcrypt_costs(args) -> Iterator[tuple[dict, Callable[[], str]]]:
+    for rounds in range(args.min_cost, args.max_cost + 1):
+        handler = bcrypt.using(rounds=rounds)
+        yield {"BCRYPT_ROUNDS": rounds}, partial(handler.hash, PASSWORD)
+
+
+def argon2_costs(args) -> Iterator[tuple[dict, Callable[[], str]]]:
+    for time_cost in range(args.min_cost, args.max_cost + 1):
+        handler = argon2.using(
+            rounds=time_cost, memory_cost=args.memory_kib, parallelism=args.parallelism
+        )
+        yield {
+            "ARGON2_TIME_COST": time_cost,
+            "ARGON2_MEMORY_COST_KIB": args.memory_kib,
+            "ARGON2_PARALLELISM": args.parallelism,
+        }, partial(handler.hash, PASSWORD)
+
+
+def calibrate(args) -> int:
+    costs = bcrypt_costs(args) if args.scheme == "bcrypt" else argon2_costs(args)
+    chosen = None
+    print(f"{'cost':<40}{'p99 ms':>10}", file=sys.stderr)
+    for params, hash_once in costs:
+        try:
+            latency = p99_ms(hash_once, args.samples, args.concurrency)
+        except MissingBackendError as error:
+            print(f"{args.scheme} is not available: {error}", file=sys.stderr)
+            return 2
+        label = ", ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{label:<40}{latency:>10.1f}", file=sys.stderr)
+        if latency > args.target_ms:
+            break
+        chosen = params
+    else:
+        if chosen is not None:
+            print(
+                f"Stopped at the maximum cost ({args.max_cost}) still within "
+                f"{args.target_ms} ms; pass --max-cost to try higher",
+                file=sys.stderr,
+            )
+
+    if chosen is None:
+        print(f"Even the minimum cost exceeds {args.target_ms} ms", file=sys.stderr)
+        return 1
+    # Keep bcrypt listed after argon2 so existing hashes still verify and migrate.
+    schemes = '["bcrypt"]' if args.scheme == "bcrypt" else '["argon2","bcrypt"]'
+    print(f"PASSWORD_SCHEMES={schemes}")
+    for key, value in chosen.items():
+        print(f"{key}={value}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scheme", choices=["bcrypt", "argon2"])
+    parser.add_argument("--target-ms", type=float, default=250.0, help="p99 budget per hash")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.password_hash_workers,
+        help="Hashes in flight at once; defaults to PASSWORD_HASH_WORKERS",
+    )
+    parser.add_argument("--samples", type=int, default=20, help="Hashes timed per cost")
+    parser.add_argument(
+        "--min-cost", type=int, default=None, help="First bcrypt rounds / argon2 time cost to try"
+    )
+    parser.add_argument(
+        "--max-cost", type=int, default=None, help="Last bcrypt rounds / argon2 time cost to try"
+    )
+    parser.add_argument("--memory-kib", type=int, default=settings.argon2_memory_cost_kib)
+    parser.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    args = parser.parse_args()
+    if args.min_cost is None:
+        args.min_cost = 10 if args.scheme == "bcrypt" else 1
+    if args.max_cost is None:
+        args.max_cost = MAX_COST[args.scheme]
+    if args.max_cost < args.min_cost:
+        parser.error("--max-cost must not be below --min-cost")
+    sys.exit(calibrate(args))
+
+
+if __name__ == "__main__":
+    main()
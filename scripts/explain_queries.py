@@ -0,0 +1,296 @@
+"""Report the API's filter queries that the database answers with full table scans.
+
+Each query shape below is built the way the list, export and lookup endpoints
+build it (``ListFilters`` plus ``Pagination``), then run through EXPLAIN and
+timed. A shape is flagged when its plan reads a table sequentially instead of
+through an index (``SCAN <table>`` in SQLite, ``Seq Scan`` in Postgres) and it
+takes at least ``--slow-ms``; the exit status is 1 if anything was flagged, so
+the report can gate CI.
+
+By default a synthetic dataset is generated in an in-memory SQLite database.
+Point ``--database-url`` at a Postgres copy to check real plans, adding
+``--seed`` if it is an empty scratch database.
+
+    python -m scripts.explain_queries
+    python -m scripts.explain_queries --database-url postgresql+asyncpg://... --slow-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "explain")
+
+from fastapi import Response
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.dependencies.filters import ListFilters
+from app.api.dependencies.pagination import Pagination
+from app.database.base import Base
+from app.database.bulk import bulk_insert
+from app.models import (
+    Appointment, DeviceData, Doctor, InsuranceClaim, InsurancePlan, LabOrder,
+    MedicalRecord, Notification, Patient, User, WearableDevice,
+)
+from app.models.appointment import AppointmentStatusEnum
+from app.models.patient import GenderEnum
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CLAIM_STATUSES = ["pending", "approved", "denied", "paid"]
+
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+class QueryReport(NamedTuple):
+    name: str
+    milliseconds: float
+    scanned: list[str]
+    plan: str
+
+
+def _filters(**values) -> ListFilters:
+    params = dict(patient_id=None, doctor_id=None, status=None, date_from=None, date_to=None)
+    params.update(values)
+    return ListFilters(**params)
+
+
+def _page(query, model):
+    return Pagination(Response(), skip=0, limit=100, after=None).apply(query, model)
+
+
+def query_shapes() -> list[tuple[str, object]]:
+    """The filter queries the API issues, with representative parameters."""
+    month = dict(date_from=date(2024, 3, 1), date_to=date(2024, 3, 31))
+    return [
+        (
+            "appointments for a patient",
+            _page(select(Appointment).where(Appointment.patient_id == 7), Appointment),
+        ),
+        (
+            "a doctor's appointments in a day",
+            select(Appointment)
+            .where(
+                Appointment.doctor_id == 3,
+                Appointment.appointment_datetime >= START + timedelta(days=30),
+                Appointment.appointment_datetime < START + timedelta(days=31),
+            )
+            .order_by(Appointment.appointment_datetime),
+        ),
+        (
+            "medical records for a patient",
+            _page(select(MedicalRecord).where(MedicalRecord.patient_id == 7), MedicalRecord),
+        ),
+        (
+            "medical records export by doctor and dates",
+            _filters(doctor_id=3, **month)
+            .apply(select(MedicalRecord), MedicalRecord, date_column=MedicalRecord.visit_date)
+            .order_by(MedicalRecord.id),
+        ),
+        (
+            "insurance claims by patient and status",
+            _filters(patient_id=7, status="pending")
+            .apply(select(InsuranceClaim), InsuranceClaim, date_column=InsuranceClaim.claim_date)
+            .order_by(InsuranceClaim.id),
+        ),
+        (
+            "lab orders by patient and dates",
+            _page(
+                _filters(patient_id=7, **month)
+                .apply(select(LabOrder), LabOrder, date_column=LabOrder.order_date),
+                LabOrder,
+            ),
+        ),
+        (
+            "device readings in a time range",
+            select(DeviceData)
+            .where(
+                DeviceData.device_id == 5,
+                DeviceData.recorded_at >= START + timedelta(days=1),
+                DeviceData.recorded_at < START + timedelta(days=2),
+            )
+            .order_by(DeviceData.recorded_at),
+        ),
+        (
+            "unread notifications for a user",
+            select(Notification)
+            .where(Notification.user_id == 7, Notification.is_read.is_(False))
+            .order_by(Notification.id),
+        ),
+    ]
+
+
+async def seed(sessions, rows: int) -> None:
+    """Generate ``rows`` records per large table, spread over a few hundred owners."""
+    people = max(rows // 40, 10)
+    async with sessions() as db:
+        await bulk_insert(db, User, [
+            {
+                "email": f"user{index}@example.test", "username": f"user{index}",
+                "hashed_password": "x", "is_active": True,
+            }
+            for index in range(people)
+        ])
+        await bulk_insert(db, Patient, [
+            {
+                "first_name": f"First{index}", "last_name": f"Last{index}",
+                "date_of_birth": date(1990, 1, 1), "gender": GenderEnum.OTHER,
+            }
+            for index in range(people)
+        ])
+        await bulk_insert(db, Doctor, [
+            {
+                "first_name": f"Doc{index}", "last_name": "Tor",
+                "email": f"doctor{index}@example.test", "specialization": "General",
+                "license_number": f"LIC-{index}",
+            }
+            for index in range(people // 10)
+        ])
+        await bulk_insert(db, InsurancePlan, [{"name": "Basic", "provider": "Acme"}])
+        await bulk_insert(db, WearableDevice, [
+            {"user_id": index % people + 1, "device_type": "watch"}
+            for index in range(people)
+        ])
+
+        def owner(index: int) -> int:
+            return index % people + 1
+
+        def doctor(index: int) -> int:
+            return index % (people // 10) + 1
+
+        await bulk_insert(db, Appointment, [
+            {
+                "patient_id": owner(index), "doctor_id": doctor(index),
+                "appointment_datetime": START + timedelta(minutes=30 * index),
+                "duration_minutes": 30, "status": AppointmentStatusEnum.SCHEDULED,
+            }
+            for index in range(rows)
+        ])
+        await bulk_insert(db, MedicalRecord, [
+            {
+                "patient_id": owner(index), "doctor_id": doctor(index),
+                "visit_date": START + timedelta(minutes=30 * index),
+                "diagnosis": "Checkup",
+            }
+            for index in range(rows)
+        ])
+        await bulk_insert(db, InsuranceClaim, [
+            {
+                "patient_id": owner(index), "plan_id": 1,
+                "claim_date": START.date() + timedelta(days=index % 365),
+                "amount": 100.0, "status": CLAIM_STATUSES[index % len(CLAIM_STATUSES)],
+            }
+            for index in range(rows)
+        ])
+        await bulk_insert(db, LabOrder, [
+            {
+                "patient_id": owner(index), "doctor_id": doctor(index),
+                "order_date": START.date() + timedelta(days=index % 365),
+                "test_type": "CBC",
+            }
+            for index in range(rows)
+        ])
+        await bulk_insert(db, DeviceData, [
+            {
+                "device_id": owner(index), "data_type": "heart_rate", "value": 70.0,
+                "unit": "bpm", "recorded_at": START + timedelta(minutes=index),
+            }
+            for index in range(rows)
+        ])
+        await bulk_insert(db, Notification, [
+            {"user_id": owner(index), "message": "Reminder", "is_read": index % 3 == 0}
+            for index in range(rows)
+        ])
+        await db.commit()
+    async with sessions() as db:
+        # Give the planner statistics, as autovacuum would in production.
+        await db.execute(text("ANALYZE"))
+        await db.commit()
+
+
+def _postgres_scans(node: dict) -> list[str]:
+    scans = [node["Relation Name"]] if node["Node Type"] == "Seq Scan" else []
+    for child in node.get("Plans", []):
+        scans.extend(_postgres_scans(child))
+    return scans
+
+
+async def explain(conn: AsyncConnection, query) -> tuple[list[str], str]:
+    """Return the tables ``query`` reads with a full scan, and its plan as text."""
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "postgresql":
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        root = plan[0]["Plan"]
+        return _postgres_scans(root), json.dumps(root, indent=2)
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+    details = [row[-1] for row in result]
+    scans = [match.group(1) for match in map(_SQLITE_SCAN.match, details) if match]
+    return scans, "\n".join(details)
+
+
+async def report(conn: AsyncConnection, *, repeat: int = 5) -> list[QueryReport]:
+    reports = []
+    for name, query in query_shapes():
+        scanned, plan = await explain(conn, query)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            (await conn.execute(query)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+        reports.append(QueryReport(name, statistics.median(timings), scanned, plan))
+    return reports
+
+
+async def run(args) -> int:
+    if args.database_url:
+        engine = create_async_engine(args.database_url)
+    else:
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    try:
+        if args.seed or not args.database_url:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            await seed(sessions, args.rows)
+        async with engine.connect() as conn:
+            reports = await report(conn, repeat=args.repeat)
+    finally:
+        await engine.dispose()
+
+    flagged = [r for r in reports if r.scanned and r.milliseconds >= args.slow_ms]
+    print(f"{'query':<46}{'ms':>9}  plan")
+    for r in reports:
+        verdict = f"FULL SCAN {', '.join(r.scanned)}" if r.scanned else "indexed"
+        print(f"{r.name:<46}{r.milliseconds:>9.3f}  {verdict}")
+    for r in flagged:
+        print(f"\n-- {r.name}\n{r.plan}", file=sys.stderr)
+    return 1 if flagged else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Existing database to inspect instead of in-memory SQLite")
+    parser.add_argument("--seed", action="store_true", help="Create tables and generate data in --database-url")
+    parser.add_argument("--rows", type=int, default=20000, help="Generated rows per large table")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query; the median is reported")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Only flag full scans at least this slow")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
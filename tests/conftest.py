@@ -7,8 +7,15 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database.base import Base
-from app.api.dependencies.database import get_async_session
+from app.api.dependencies.database import get_async_session, get_read_session
+from app.api.dependencies.auth import get_current_active_user
+from app.models.user import User
 from app.core.config import settings
+from app.auth.jwt_handler import clear_token_cache
+from app.auth.principal_cache import clear_principal_cache
+from app.auth.refresh_tokens import clear_refresh_token_cache
+from app.auth.stateless import clear_revocations
+from app.database.availability import clear_longest_booking
 
 # Test database URL (use in-memory SQLite for tests)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -22,6 +29,22 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Keep process-wide caches from leaking state between tests."""
+    clear_principal_cache()
+    clear_token_cache()
+    clear_revocations()
+    clear_refresh_token_cache()
+    clear_longest_booking()
+    yield
+    clear_principal_cache()
+    clear_token_cache()
+    clear_revocations()
+    clear_refresh_token_cache()
+    clear_longest_booking()
+
+
 @pytest_asyncio.fixture
 async def test_engine():
     """Create test database engine."""
@@ -61,6 +84,7 @@ async def test_client(test_session):
         yield test_session
 
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
 
     from httpx import ASGITransport
     transport = ASGITransport(app=app)
@@ -70,6 +94,17 @@ async def test_client(test_session):
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def authorized_client(test_client):
+    """Test client with authentication bypassed."""
+
+    async def override_get_current_active_user():
+        return User(id=1, email="test@example.com", username="testuser", is_active=True)
+
+    app.dependency_overrides[get_current_active_user] = override_get_current_active_user
+    yield test_client
+
+
 @pytest.fixture
 def test_user_data():
     """Test user data."""
@@ -0,0 +1,369 @@
+from contextlib import contextmanager
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event, update
+
+from app.core.config import settings
+from app.database.availability import clear_longest_booking, longest_booking
+from app.models.appointment import Appointment
+
+
+@contextmanager
+def recorded_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest_asyncio.fixture
+async def appointment_id(authorized_client: AsyncClient, test_patient_data, test_doctor_data):
+    patient = await authorized_client.post("/patients/", json=test_patient_data)
+    doctor = await authorized_client.post("/doctors/", json=test_doctor_data)
+    response = await authorized_client.post(
+        "/appointments/",
+        json={
+            "patient_id": patient.json()["id"],
+            "doctor_id": doctor.json()["id"],
+            "appointment_datetime": "2024-03-01T09:00:00Z",
+            "reason": "Checkup",
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_create_appointment_single_statement(
+    authorized_client: AsyncClient, test_patient_data, test_doctor_data, test_engine, test_session
+):
+    patient = (await authorized_client.post("/patients/", json=test_patient_data)).json()
+    doctor = (await authorized_client.post("/doctors/", json=test_doctor_data)).json()
+    payload = {
+        "patient_id": patient["id"],
+        "doctor_id": doctor["id"],
+        "appointment_datetime": "2024-03-01T09:00:00Z",
+    }
+    # Read once per interval, not per booking.
+    await longest_booking(test_session)
+
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.post("/appointments/", json=payload)
+    assert response.status_code == 200
+    assert statements == ["INSERT"]
+    data = response.json()
+    assert data["status"] == "scheduled"
+    assert data["duration_minutes"] == 30
+    assert data["created_at"] is not None
+
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.post(
+            "/appointments/", json={**payload, "doctor_id": 9999}
+        )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Doctor not found"
+    assert statements == ["INSERT", "SELECT"]
+
+    response = await authorized_client.post(
+        "/appointments/", json={**payload, "patient_id": 9999, "doctor_id": 9999}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Patient not found"
+
+
+@pytest.mark.asyncio
+async def test_update_appointment_status(
+    authorized_client: AsyncClient, appointment_id, test_engine
+):
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.patch(
+            f"/appointments/{appointment_id}/status", json={"status": "confirmed"}
+        )
+    assert response.status_code == 200
+    assert statements == ["UPDATE"]
+    data = response.json()
+    assert data["status"] == "confirmed"
+    assert data["reason"] == "Checkup"
+    assert data["updated_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_update_missing_appointment_status(authorized_client: AsyncClient):
+    response = await authorized_client.patch(
+        "/appointments/9999/status", json={"status": "confirmed"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_appointment_single_statement(
+    authorized_client: AsyncClient, appointment_id, test_engine
+):
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.delete(f"/appointments/{appointment_id}")
+        assert response.status_code == 200
+        assert statements == ["DELETE"]
+
+    missing = await authorized_client.delete(f"/appointments/{appointment_id}")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_appointments(authorized_client: AsyncClient, appointment_id):
+    response = await authorized_client.post(
+        "/appointments/bulk-delete", json={"ids": [appointment_id, 9999]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [appointment_id], "not_found": [9999]}
+
+    response = await authorized_client.get(f"/appointments/{appointment_id}")
+    assert response.status_code == 404
+
+    response = await authorized_client.post("/appointments/bulk-delete", json={"ids": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_appointments_checks_parents(
+    authorized_client: AsyncClient, test_patient_data, test_doctor_data
+):
+    patient = (await authorized_client.post("/patients/", json=test_patient_data)).json()
+    doctor = (await authorized_client.post("/doctors/", json=test_doctor_data)).json()
+    valid = {
+        "patient_id": patient["id"],
+        "doctor_id": doctor["id"],
+        "appointment_datetime": "2024-03-01T09:00:00Z",
+    }
+
+    later = {**valid, "appointment_datetime": "2024-03-01T10:00:00Z"}
+    response = await authorized_client.post(
+        "/appointments/bulk", json=[valid, {**valid, "doctor_id": 9999}, later]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["failed"]) == (2, 1)
+    assert data["results"][1] == {"index": 1, "id": None, "error": "Doctor not found"}
+    assert data["results"][0]["id"] < data["results"][2]["id"]
+
+
+@pytest.mark.asyncio
+async def test_list_matches_single_read_serialization(
+    authorized_client: AsyncClient, appointment_id
+):
+    single = (await authorized_client.get(f"/appointments/{appointment_id}")).json()
+
+    response = await authorized_client.get("/appointments/")
+    assert response.status_code == 200
+    assert response.json() == [single]
+    # Integer columns declared bool in the schema still come out as booleans.
+    assert response.json()[0]["reminder_sent"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_appointment_expand(
+    authorized_client: AsyncClient, appointment_id, test_engine
+):
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.get(f"/appointments/{appointment_id}")
+    assert response.status_code == 200
+    assert "patient" not in response.json() and "doctor" not in response.json()
+    assert statements == ["SELECT"]
+
+    with recorded_statements(test_engine) as statements:
+        response = await authorized_client.get(
+            f"/appointments/{appointment_id}", params={"expand": "patient,doctor"}
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["patient"]["first_name"] == "John"
+    assert data["doctor"]["license_number"] == "MD123456"
+    assert statements == ["SELECT"]
+
+    response = await authorized_client.get("/appointments/", params={"expand": "doctor"})
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["doctor"]["id"] == data["doctor"]["id"]
+    assert "patient" not in item
+
+
+@pytest.mark.asyncio
+async def test_expand_rejects_unknown_relationship(authorized_client: AsyncClient, appointment_id):
+    response = await authorized_client.get(
+        f"/appointments/{appointment_id}", params={"expand": "status"}
+    )
+    assert response.status_code == 400
+
+    response = await authorized_client.get(
+        "/appointments/", params={"expand": "patient", "fields": "status"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_rejects_double_booking(authorized_client: AsyncClient, appointment_id):
+    booked = (await authorized_client.get(f"/appointments/{appointment_id}")).json()
+    payload = {
+        "patient_id": booked["patient_id"],
+        "doctor_id": booked["doctor_id"],
+        "appointment_datetime": "2024-03-01T09:15:00Z",
+    }
+
+    response = await authorized_client.post("/appointments/", json=payload)
+    assert response.status_code == 409
+    assert response.json()["detail"] == f"Doctor is already booked by appointment {appointment_id}"
+
+    # Back-to-back bookings do not overlap.
+    response = await authorized_client.post(
+        "/appointments/", json={**payload, "appointment_datetime": "2024-03-01T09:30:00Z"}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_cancelled_appointment_frees_its_slot(authorized_client: AsyncClient, appointment_id):
+    booked = (await authorized_client.get(f"/appointments/{appointment_id}")).json()
+    await authorized_client.patch(
+        f"/appointments/{appointment_id}/status", json={"status": "cancelled"}
+    )
+
+    response = await authorized_client.post(
+        "/appointments/",
+        json={
+            "patient_id": booked["patient_id"],
+            "doctor_id": booked["doctor_id"],
+            "appointment_datetime": "2024-03-01T09:00:00Z",
+            "duration_minutes": 60,
+        },
+    )
+    assert response.status_code == 200
+    replacement = response.json()["id"]
+
+    response = await authorized_client.patch(
+        f"/appointments/{appointment_id}/status", json={"status": "scheduled"}
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == f"Doctor is already booked by appointment {replacement}"
+
+    response = await authorized_client.put(
+        f"/appointments/{appointment_id}",
+        json={"appointment_datetime": "2024-03-01T10:00:00Z", "status": "scheduled"},
+    )
+    assert response.status_code == 200
+    response = await authorized_client.put(
+        f"/appointments/{appointment_id}", json={"duration_minutes": 0}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_rows_above_duration_cap_still_serialize(
+    authorized_client: AsyncClient, test_session, appointment_id
+):
+    # Stored before the cap existed, or before the setting was lowered.
+    await test_session.execute(
+        update(Appointment)
+        .where(Appointment.id == appointment_id)
+        .values(duration_minutes=settings.max_appointment_minutes + 60)
+    )
+    await test_session.commit()
+
+    assert (await authorized_client.get(f"/appointments/{appointment_id}")).status_code == 200
+    assert (await authorized_client.get("/appointments/")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_rows_above_duration_cap_still_hold_their_slot(
+    authorized_client: AsyncClient, test_session, appointment_id
+):
+    # Starts at 09:00 and runs into the next day, further back than the cap reaches.
+    await test_session.execute(
+        update(Appointment)
+        .where(Appointment.id == appointment_id)
+        .values(duration_minutes=settings.max_appointment_minutes + 600)
+    )
+    await test_session.commit()
+    clear_longest_booking()
+    booked = (await authorized_client.get(f"/appointments/{appointment_id}")).json()
+    payload = {
+        "patient_id": booked["patient_id"],
+        "doctor_id": booked["doctor_id"],
+        "appointment_datetime": "2024-03-01T20:00:00Z",
+    }
+
+    response = await authorized_client.post("/appointments/", json=payload)
+    assert response.status_code == 409
+    assert response.json()["detail"] == f"Doctor is already booked by appointment {appointment_id}"
+
+    later = await authorized_client.post(
+        "/appointments/", json={**payload, "appointment_datetime": "2024-03-05T09:00:00Z"}
+    )
+    assert later.status_code == 200
+    response = await authorized_client.put(
+        f"/appointments/{later.json()['id']}",
+        json={"appointment_datetime": "2024-03-01T20:00:00Z"},
+    )
+    assert response.status_code == 409
+
+    response = await authorized_client.get(
+        f"/doctors/{booked['doctor_id']}/availability",
+        params={"date_from": "2024-03-01", "date_to": "2024-03-01"},
+    )
+    assert response.json()["slots"] == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_overlaps(authorized_client: AsyncClient, appointment_id):
+    booked = (await authorized_client.get(f"/appointments/{appointment_id}")).json()
+    base = {"patient_id": booked["patient_id"], "doctor_id": booked["doctor_id"]}
+
+    response = await authorized_client.post(
+        "/appointments/bulk",
+        json=[
+            {**base, "appointment_datetime": "2024-03-01T09:20:00Z"},
+            {**base, "appointment_datetime": "2024-03-01T11:00:00Z", "duration_minutes": 60},
+            {**base, "appointment_datetime": "2024-03-01T11:30:00Z"},
+            {**base, "appointment_datetime": "2024-03-01T12:00:00Z"},
+        ],
+    )
+    assert response.status_code == 200
+    errors = [item["error"] for item in response.json()["results"]]
+    assert errors == [
+        f"Doctor is already booked by appointment {appointment_id}",
+        None,
+        "Doctor is already booked by item 1 of this batch",
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_doctor_availability(authorized_client: AsyncClient, appointment_id):
+    doctor_id = (await authorized_client.get(f"/appointments/{appointment_id}")).json()["doctor_id"]
+
+    # 2024-03-01 is a Friday; the clinic is closed on the Saturday.
+    response = await authorized_client.get(
+        f"/doctors/{doctor_id}/availability",
+        params={"date_from": "2024-03-01", "date_to": "2024-03-02", "duration_minutes": 60},
+    )
+    assert response.status_code == 200
+    slots = response.json()["slots"]
+    assert slots[0] == {"start": "2024-03-01T09:30:00Z", "end": "2024-03-01T10:30:00Z"}
+    assert slots[-1] == {"start": "2024-03-01T16:00:00Z", "end": "2024-03-01T17:00:00Z"}
+    assert len(slots) == 27
+
+    response = await authorized_client.get(
+        "/doctors/9999/availability", params={"date_from": "2024-03-01"}
+    )
+    assert response.status_code == 404
+    response = await authorized_client.get(
+        f"/doctors/{doctor_id}/availability",
+        params={"date_from": "2024-03-02", "date_to": "2024-03-01"},
+    )
+    assert response.status_code == 400
@@ -1,5 +1,36 @@
+import asyncio
+import time
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import event, select, update
+from datetime import datetime, timedelta, timezone
+from app.auth import jwt_handler
+from app.auth.jwt_handler import (
+    JoseBackend,
+    PyJWTBackend,
+    create_access_token,
+    set_jwt_backend,
+    verify_token,
+)
+from app.auth.refresh_tokens import clear_refresh_token_cache, purge_expired_refresh_tokens
+from app.auth import stateless
+from app.auth.stateless import revoke_token
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.database.crud import delete_object, update_object
+from app.core.security import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    build_password_context,
+    get_password_hash,
+    password_hasher,
+)
+from app.models.refresh_token import RefreshToken
+from app.models.role import Permission, Role, RolePermission, UserRole
+from app.models.user import User
+from app.utils.cache import ExpiringStore
 
 
 @pytest.mark.asyncio
@@ -48,3 +79,453 @@ async def test_login_invalid_credentials(test_client: AsyncClient):
     login_data = {"username": "nonexistent", "password": "wrongpassword"}
     response = await test_client.post("/auth/login", data=login_data)
     assert response.status_code == 401
+
+
+async def _login(test_client: AsyncClient, test_user_data) -> dict:
+    await test_client.post("/auth/register", json=test_user_data)
+    response = await test_client.post(
+        "/auth/login",
+        data={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"],
+        },
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_reuse_cached_principal(
+    test_client: AsyncClient, test_engine, test_user_data
+):
+    """Only the first authenticated request should look the user up."""
+    headers = await _login(test_client, test_user_data)
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(3):
+            response = await test_client.get("/patients/", headers=headers)
+            assert response.status_code == 200
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_deactivating_user_invalidates_cached_principal(
+    test_client: AsyncClient, test_session, test_user_data
+):
+    headers = await _login(test_client, test_user_data)
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 200
+
+    result = await test_session.execute(
+        select(User).where(User.username == test_user_data["username"])
+    )
+    user = result.scalar_one()
+    user.is_active = False
+    await test_session.commit()
+
+    response = await test_client.get("/patients/", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_statement_updates_invalidate_cached_principal(
+    test_client: AsyncClient, test_session, test_user_data
+):
+    """update_object/delete_object bypass mapper events; the cache must still drop the user."""
+    headers = await _login(test_client, test_user_data)
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 200
+    user_id = (
+        await test_session.execute(
+            select(User.id).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+
+    await update_object(test_session, User, user_id, {"is_active": False})
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 400
+
+    await delete_object(test_session, User, user_id)
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_keeps_event_loop_responsive():
+    hasher = PasswordHasher(max_workers=2, max_waiting=8)
+    hashed = get_password_hash("secret")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        results = await asyncio.gather(*(hasher.verify("secret", hashed) for _ in range(4)))
+    finally:
+        task.cancel()
+        hasher.shutdown()
+
+    assert results == [True] * 4
+    assert hasher.completed["verify"] == 4
+    # bcrypt ran in workers, so the loop kept ticking throughout.
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_sheds_load_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_waiting=1)
+    try:
+        results = await asyncio.gather(
+            *(hasher.hash("secret") for _ in range(3)), return_exceptions=True
+        )
+    finally:
+        hasher.shutdown()
+
+    assert [type(result) for result in results[:2]] == [str, str]
+    assert isinstance(results[2], PasswordHasherBusy)
+    assert hasher.rejected == 1
+    assert "password_hash_operations_total" in render_metrics()
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_outdated_hash(
+    test_client: AsyncClient, test_session, test_user_data, monkeypatch
+):
+    def use_rounds(rounds: int):
+        config = settings.model_copy(update={"bcrypt_rounds": rounds})
+        monkeypatch.setattr(security, "pwd_context", build_password_context(config))
+
+    async def stored_hash() -> str:
+        result = await test_session.execute(
+            select(User.hashed_password).where(User.username == test_user_data["username"])
+        )
+        return result.scalar_one()
+
+    use_rounds(4)
+    await test_client.post("/auth/register", json=test_user_data)
+    assert (await stored_hash()).startswith("$2b$04$")
+
+    use_rounds(5)
+    login_data = {
+        "username": test_user_data["username"],
+        "password": test_user_data["password"],
+    }
+    rehashed = password_hasher.completed["rehash"]
+    assert (await test_client.post("/auth/login", data=login_data)).status_code == 200
+    assert (await stored_hash()).startswith("$2b$05$")
+    assert password_hasher.completed["rehash"] == rehashed + 1
+
+    assert (await test_client.post("/auth/login", data=login_data)).status_code == 200
+    assert password_hasher.completed["rehash"] == rehashed + 1
+
+
+class CountingBackend(JoseBackend):
+    def __init__(self):
+        super().__init__()
+        self.decodes = 0
+
+    def decode(self, token, key, algorithms):
+        self.decodes += 1
+        return super().decode(token, key, algorithms)
+
+
+@pytest.fixture
+def counting_backend():
+    backend = CountingBackend()
+    set_jwt_backend(backend)
+    yield backend
+    set_jwt_backend(JoseBackend())
+
+
+def test_verified_token_claims_are_cached(counting_backend):
+    token = create_access_token({"sub": "alice"})
+
+    assert [verify_token(token) for _ in range(3)] == ["alice"] * 3
+    assert counting_backend.decodes == 1
+
+
+def test_expired_and_invalid_tokens_are_not_cached(counting_backend):
+    expired = create_access_token({"sub": "alice"}, expires_delta=timedelta(minutes=-1))
+    assert verify_token(expired) is None
+    assert verify_token(expired) is None
+    assert verify_token("not-a-token") is None
+    assert counting_backend.decodes == 3
+    assert len(jwt_handler._claims_cache) == 0
+
+
+def test_pyjwt_backend_verifies_jose_tokens():
+    pytest.importorskip("jwt")
+    token = create_access_token({"sub": "alice"})
+    set_jwt_backend(PyJWTBackend())
+    try:
+        assert verify_token(token) == "alice"
+        issued = create_access_token({"sub": "bob"})
+    finally:
+        set_jwt_backend(JoseBackend())
+    assert verify_token(issued) == "bob"
+
+
+@pytest_asyncio.fixture
+async def stateless_headers(test_client: AsyncClient, test_session, test_user_data, monkeypatch):
+    monkeypatch.setattr(settings, "stateless_auth", True)
+    await test_client.post("/auth/register", json=test_user_data)
+    user = (
+        await test_session.execute(
+            select(User).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    role = Role(name="clinician")
+    permission = Permission(name="records:read")
+    test_session.add_all([role, permission])
+    await test_session.flush()
+    test_session.add_all([
+        UserRole(user_id=user.id, role_id=role.id),
+        RolePermission(role_id=role.id, permission_id=permission.id),
+    ])
+    await test_session.commit()
+    return await _login(test_client, test_user_data)
+
+
+@pytest.mark.asyncio
+async def test_stateless_token_authorizes_without_user_lookup(
+    test_client: AsyncClient, test_engine, stateless_headers
+):
+    token = stateless_headers["Authorization"].split()[1]
+    claims = jwt_handler.decode_token(token)
+    assert (claims["roles"], claims["perms"], claims["active"]) == (
+        ["clinician"], ["records:read"], True
+    )
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "users" in statement:
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(3):
+            response = await test_client.get("/patients/", headers=stateless_headers)
+            assert response.status_code == 200
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements == []
+
+
+def test_stateless_principal_carries_only_claims():
+    claims = {
+        "sub": "alice",
+        "uid": 7,
+        "active": True,
+        "su": False,
+        "roles": ["clinician"],
+        "perms": ["records:read"],
+        "iat_ns": time.time_ns(),
+    }
+    user = stateless.principal_from_claims(claims)
+    assert (user.id, user.username, user.is_active, user.is_superuser) == (7, "alice", True, False)
+    assert user.roles == {"clinician"}
+    assert (user.email, user.created_at, user.hashed_password) == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_stateless_tokens_can_be_revoked(test_client: AsyncClient, stateless_headers):
+    token = stateless_headers["Authorization"].split()[1]
+    revoke_token(jwt_handler.decode_token(token)["jti"])
+    response = await test_client.get("/patients/", headers=stateless_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_updating_user_revokes_stateless_tokens(
+    test_client: AsyncClient, test_session, test_user_data, stateless_headers
+):
+    assert (await test_client.get("/patients/", headers=stateless_headers)).status_code == 200
+
+    user = (
+        await test_session.execute(
+            select(User).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    user.is_active = False
+    await test_session.commit()
+
+    response = await test_client.get("/patients/", headers=stateless_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_statement_updates_revoke_stateless_tokens(
+    test_client: AsyncClient, test_session, test_user_data, stateless_headers
+):
+    user_id = (
+        await test_session.execute(
+            select(User.id).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    await update_object(test_session, User, user_id, {"is_superuser": True})
+
+    response = await test_client.get("/patients/", headers=stateless_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_only_authorization_changes_revoke_stateless_tokens(
+    test_client: AsyncClient, test_session, test_user_data, stateless_headers, monkeypatch
+):
+    user_id = (
+        await test_session.execute(
+            select(User.id).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    await update_object(test_session, User, user_id, {"email": "renamed@example.com"})
+    assert (await test_client.get("/patients/", headers=stateless_headers)).status_code == 200
+
+    # Logging in again on another device rehashes the password at a higher cost.
+    config = settings.model_copy(update={"bcrypt_rounds": settings.bcrypt_rounds + 1})
+    monkeypatch.setattr(security, "pwd_context", build_password_context(config))
+    rehashed = password_hasher.completed["rehash"]
+    await _login(test_client, test_user_data)
+    assert password_hasher.completed["rehash"] == rehashed + 1
+    assert (await test_client.get("/patients/", headers=stateless_headers)).status_code == 200
+
+    new_hash = get_password_hash("a-new-password")
+    await update_object(test_session, User, user_id, {"hashed_password": new_hash})
+    assert (await test_client.get("/patients/", headers=stateless_headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_right_after_revocation_is_accepted(
+    test_client: AsyncClient, test_session, test_user_data, stateless_headers
+):
+    user = (
+        await test_session.execute(
+            select(User).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    user.is_superuser = True
+    await test_session.commit()
+
+    # Usually within the same second as the revocation the update caused.
+    headers = await _login(test_client, test_user_data)
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 200
+    assert (await test_client.get("/patients/", headers=stateless_headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_full_revocation_list_fails_closed(
+    test_client: AsyncClient, test_user_data, stateless_headers, monkeypatch
+):
+    monkeypatch.setattr(stateless, "_revoked", ExpiringStore(max_size=1, ttl=60))
+    revoke_token("some-other-token")
+    token = stateless_headers["Authorization"].split()[1]
+    revoke_token(jwt_handler.decode_token(token)["jti"])
+
+    response = await test_client.get("/patients/", headers=stateless_headers)
+    assert response.status_code == 401
+    headers = await _login(test_client, test_user_data)
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 200
+
+
+async def _login_tokens(test_client: AsyncClient, test_user_data) -> dict:
+    await test_client.post("/auth/register", json=test_user_data)
+    response = await test_client.post(
+        "/auth/login",
+        data={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"],
+        },
+    )
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_without_password_verification(
+    test_client: AsyncClient, test_user_data
+):
+    tokens = await _login_tokens(test_client, test_user_data)
+    verified = password_hasher.completed["verify"]
+
+    response = await test_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    renewed = response.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    assert password_hasher.completed["verify"] == verified
+
+    headers = {"Authorization": f"Bearer {renewed['access_token']}"}
+    assert (await test_client.get("/patients/", headers=headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_reused_refresh_token_revokes_its_family(test_client: AsyncClient, test_user_data):
+    tokens = await _login_tokens(test_client, test_user_data)
+    first = tokens["refresh_token"]
+    second = (await test_client.post("/auth/refresh", json={"refresh_token": first})).json()
+
+    # Another worker: nothing cached, everything comes from the table.
+    clear_refresh_token_cache()
+    response = await test_client.post("/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 401
+    response = await test_client.post(
+        "/auth/refresh", json={"refresh_token": second["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(test_client: AsyncClient, test_user_data):
+    tokens = await _login_tokens(test_client, test_user_data)
+    body = {"refresh_token": tokens["refresh_token"]}
+
+    assert (await test_client.post("/auth/logout", json=body)).status_code == 200
+    assert (await test_client.post("/auth/refresh", json=body)).status_code == 401
+    clear_refresh_token_cache()
+    assert (await test_client.post("/auth/refresh", json=body)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_deactivated_user(
+    test_client: AsyncClient, test_session, test_user_data
+):
+    tokens = await _login_tokens(test_client, test_user_data)
+    user = (
+        await test_session.execute(
+            select(User).where(User.username == test_user_data["username"])
+        )
+    ).scalar_one()
+    user.is_active = False
+    await test_session.commit()
+
+    response = await test_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_expired_refresh_tokens_are_purged(test_client: AsyncClient, test_session, test_user_data):
+    tokens = await _login_tokens(test_client, test_user_data)
+    await test_client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    # Expire the rotated token only; the current one must survive the purge.
+    await test_session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.revoked_at.is_not(None))
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+
+    assert await purge_expired_refresh_tokens(test_session) == 1
+    await test_session.commit()
+    remaining = (await test_session.execute(select(RefreshToken))).scalars().all()
+    assert [row.revoked_at for row in remaining] == [None]
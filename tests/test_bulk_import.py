@@ -0,0 +1,107 @@
+import io
+import json
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models.import_checkpoint import ImportCheckpoint
+from app.models.patient import Patient
+from scripts import bulk_import
+from scripts.bulk_import import import_file
+
+CSV_HEADER = "first_name,last_name,email,date_of_birth,gender,phone\n"
+
+
+def _csv_row(index: int) -> str:
+    return f"First{index},Last{index},p{index}@example.com,1990-01-01,female,\n"
+
+
+async def _patient_count(sessions) -> int:
+    async with sessions() as db:
+        return (await db.execute(select(func.count()).select_from(Patient))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_import_csv_in_chunks_with_rejects(test_engine, tmp_path):
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    source = tmp_path / "patients.csv"
+    rows = [_csv_row(index) for index in range(5)]
+    rows.insert(2, "Broken,Row,broken@example.com,not-a-date,female,\n")
+    source.write_text(CSV_HEADER + "".join(rows))
+    rejects = io.StringIO()
+    progress = io.StringIO()
+
+    state = await import_file(
+        sessions, "patients", source, chunk_size=2, rejects=rejects, progress=progress
+    )
+
+    assert (state["position"], state["imported"], state["rejected"]) == (6, 5, 1)
+    assert await _patient_count(sessions) == 5
+    reject = json.loads(rejects.getvalue())
+    assert reject["record"] == 3
+    assert reject["errors"][0]["loc"] == ["date_of_birth"]
+    assert len(progress.getvalue().splitlines()) == 3
+    async with sessions() as db:
+        query = select(Patient).where(Patient.email == "p0@example.com")
+        patient = (await db.execute(query)).scalar_one()
+    assert patient.phone is None
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_resumes_from_checkpoint(test_engine, tmp_path):
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    source = tmp_path / "patients.ndjson"
+    checkpoint = "patients-ndjson"
+    records = [
+        {
+            "first_name": f"First{index}",
+            "last_name": f"Last{index}",
+            "email": f"p{index}@example.com",
+            "date_of_birth": "1990-01-01",
+            "gender": "male",
+        }
+        for index in range(4)
+    ]
+    source.write_text("\n".join(json.dumps(record) for record in records[:3]) + "\n\n")
+
+    state = await import_file(sessions, "patients", source, chunk_size=2, checkpoint=checkpoint)
+    assert state["position"] == 3
+    async with sessions() as db:
+        saved = await db.get(ImportCheckpoint, checkpoint)
+    assert (saved.position, saved.imported) == (3, 3)
+
+    with source.open("a") as stream:
+        stream.write(json.dumps(records[3]) + "\n")
+    state = await import_file(sessions, "patients", source, chunk_size=2, checkpoint=checkpoint)
+
+    assert (state["position"], state["imported"]) == (4, 4)
+    assert await _patient_count(sessions) == 4
+
+    with pytest.raises(ValueError):
+        await import_file(sessions, "appointments", source, checkpoint=checkpoint)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_leaves_checkpoint_with_committed_rows(test_engine, tmp_path, monkeypatch):
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    source = tmp_path / "patients.csv"
+    source.write_text(CSV_HEADER + "".join(_csv_row(index) for index in range(4)))
+    real_insert = bulk_import.bulk_insert
+    calls = []
+
+    async def fail_second_chunk(db, model, rows):
+        calls.append(len(rows))
+        inserted = await real_insert(db, model, rows)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return inserted
+
+    monkeypatch.setattr(bulk_import, "bulk_insert", fail_second_chunk)
+    with pytest.raises(RuntimeError):
+        await import_file(sessions, "patients", source, chunk_size=2, checkpoint="patients")
+    monkeypatch.setattr(bulk_import, "bulk_insert", real_insert)
+
+    # The second chunk rolled back together with its checkpoint update.
+    assert await _patient_count(sessions) == 2
+    state = await import_file(sessions, "patients", source, chunk_size=2, checkpoint="patients")
+    assert (state["position"], state["imported"]) == (4, 4)
+    assert await _patient_count(sessions) == 4
@@ -0,0 +1,191 @@
+import json
+import pytest
+import pytest_asyncio
+from typing import Annotated, List
+from httpx import AsyncClient
+from pydantic import Field, TypeAdapter
+from sqlalchemy import func, select
+from app.api.routes import devices
+from app.core.config import settings
+from app.models.device import WearableDevice, DeviceData
+from app.schemas.device import DeviceDataCreate
+
+
+@pytest_asyncio.fixture
+async def wearable_device(test_session):
+    device = WearableDevice(user_id=1, device_type="smartwatch", serial_number="SW-001")
+    test_session.add(device)
+    await test_session.commit()
+    return device
+
+
+def _readings(device_id: int, count: int) -> list[dict]:
+    return [
+        {
+            "device_id": device_id,
+            "data_type": "heart_rate",
+            "value": 60 + index % 40,
+            "unit": "bpm",
+            "recorded_at": f"2024-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ingest_json_batch(authorized_client: AsyncClient, test_session, wearable_device):
+    response = await authorized_client.post(
+        "/devices/data/batch", json=_readings(wearable_device.id, 2500)
+    )
+    assert response.status_code == 200
+    assert response.json() == {"ingested": 2500}
+
+    count = await test_session.scalar(select(func.count()).select_from(DeviceData))
+    assert count == 2500
+
+
+@pytest.mark.asyncio
+async def test_ingest_ndjson_batch(authorized_client: AsyncClient, test_session, wearable_device):
+    body = "\n".join(json.dumps(r) for r in _readings(wearable_device.id, 10)) + "\n"
+    response = await authorized_client.post(
+        "/devices/data/batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"ingested": 10}
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_invalid_reading(authorized_client: AsyncClient, wearable_device):
+    readings = _readings(wearable_device.id, 3)
+    del readings[1]["recorded_at"]
+    response = await authorized_client.post("/devices/data/batch", json=readings)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == [1, "recorded_at"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_unknown_device(authorized_client: AsyncClient, test_session):
+    response = await authorized_client.post("/devices/data/batch", json=_readings(999, 1))
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def max_batch_5(monkeypatch):
+    monkeypatch.setattr(settings, "device_ingest_max_batch", 5)
+    monkeypatch.setattr(
+        devices,
+        "device_data_batch",
+        TypeAdapter(Annotated[List[DeviceDataCreate], Field(max_length=5)]),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_oversized_json_batch(
+    authorized_client: AsyncClient, wearable_device, max_batch_5
+):
+    readings = _readings(wearable_device.id, 6)
+    # Invalid past the limit: validation must stop before reaching it.
+    del readings[5]["recorded_at"]
+    response = await authorized_client.post("/devices/data/batch", json=readings)
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_oversized_ndjson_batch(
+    authorized_client: AsyncClient, wearable_device, max_batch_5
+):
+    body = "\n".join(json.dumps(r) for r in _readings(wearable_device.id, 6))
+    response = await authorized_client.post(
+        "/devices/data/batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_oversized_body(
+    authorized_client: AsyncClient, wearable_device, monkeypatch
+):
+    monkeypatch.setattr(settings, "device_ingest_max_body_bytes", 1024)
+    response = await authorized_client.post(
+        "/devices/data/batch", json=_readings(wearable_device.id, 20)
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_rollups_are_maintained_across_batches(authorized_client: AsyncClient, wearable_device):
+    def reading(timestamp: str, value: float) -> dict:
+        return {
+            "device_id": wearable_device.id,
+            "data_type": "heart_rate",
+            "value": value,
+            "unit": "bpm",
+            "recorded_at": timestamp,
+        }
+
+    await authorized_client.post(
+        "/devices/data/batch",
+        json=[reading("2024-01-01T10:00:05Z", 60), reading("2024-01-01T10:30:00Z", 80)],
+    )
+    await authorized_client.post(
+        "/devices/data/batch",
+        json=[reading("2024-01-01T10:59:59Z", 100), reading("2024-01-01T11:00:00Z", 70)],
+    )
+
+    response = await authorized_client.get(
+        f"/devices/{wearable_device.id}/rollups",
+        params={
+            "data_type": "heart_rate",
+            "resolution": "1h",
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-01-02T00:00:00Z",
+        },
+    )
+    assert response.status_code == 200
+    buckets = response.json()
+    assert [(b["count"], b["min"], b["max"], b["avg"]) for b in buckets] == [
+        (3, 60, 100, 80),
+        (1, 70, 70, 70),
+    ]
+
+    response = await authorized_client.get(
+        f"/devices/{wearable_device.id}/rollups",
+        params={
+            "data_type": "heart_rate",
+            "resolution": "1d",
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-01-02T00:00:00Z",
+        },
+    )
+    assert [(b["count"], b["avg"]) for b in response.json()] == [(4, 77.5)]
+
+    # A bound without an offset is read as UTC rather than compared to an aware one.
+    response = await authorized_client.get(
+        f"/devices/{wearable_device.id}/rollups",
+        params={
+            "data_type": "heart_rate",
+            "resolution": "1d",
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-01-02T00:00:00",
+        },
+    )
+    assert response.status_code == 200
+    assert [b["count"] for b in response.json()] == [4]
+
+
+@pytest.mark.asyncio
+async def test_rollup_range_is_bounded(authorized_client: AsyncClient, wearable_device):
+    response = await authorized_client.get(
+        f"/devices/{wearable_device.id}/rollups",
+        params={
+            "data_type": "heart_rate",
+            "resolution": "1m",
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-06-01T00:00:00Z",
+        },
+    )
+    assert response.status_code == 400
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from scripts.explain_queries import report, seed
+
+
+@pytest.mark.asyncio
+async def test_filter_queries_use_indexes(test_engine):
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    await seed(sessions, 4000)
+
+    async with test_engine.connect() as conn:
+        reports = await report(conn, repeat=1)
+
+    assert reports
+    assert {r.name: r.scanned for r in reports if r.scanned} == {}
+
+
+@pytest.mark.asyncio
+async def test_unindexed_filter_is_reported(test_engine):
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    await seed(sessions, 4000)
+
+    async with test_engine.connect() as conn:
+        await conn.execute(text("DROP INDEX ix_notifications_user_id_is_read"))
+        reports = {r.name: r for r in await report(conn, repeat=1)}
+
+    assert reports["unread notifications for a user"].scanned == ["notifications"]
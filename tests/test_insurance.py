@@ -1,8 +1,13 @@
+import csv
+import io
+import json
+from datetime import date
 import pytest
 from httpx import AsyncClient
 from app.models.insurance import InsurancePlan, InsuranceClaim, Payment, Invoice
 from app.models.user import User
 from app.api.dependencies.auth import get_current_active_user
+from app.core.config import settings
 
 
 # Fixtures for test data
@@ -220,4 +225,42 @@ async def test_delete_invoice(test_client: AsyncClient):
     # Assuming an invoice with ID 1 exists
     response = await test_client.delete("/insurance/invoices/1")
     assert response.status_code == 200
-    assert response.json() == {"ok": True} 
\ No newline at end of file
+    assert response.json() == {"ok": True} 
+
+@pytest.mark.asyncio
+async def test_export_payments_streams_ndjson_and_csv(
+    authorized_client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "export_chunk_size", 2)
+    test_session.add_all(
+        Payment(
+            patient_id=1 + index % 2,
+            amount=10.0 * index,
+            payment_date=date(2023, 1, 1 + index),
+        )
+        for index in range(5)
+    )
+    await test_session.commit()
+
+    response = await authorized_client.get("/insurance/payments/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["amount"] for row in rows] == [0.0, 10.0, 20.0, 30.0, 40.0]
+    assert rows[0]["payment_date"] == "2023-01-01"
+    assert rows[0]["invoice_id"] is None
+
+    response = await authorized_client.get(
+        "/insurance/payments/export", params={"format": "csv", "patient_id": 2}
+    )
+    assert response.status_code == 200
+    assert 'filename="payments.csv"' in response.headers["content-disposition"]
+    header, *lines = list(csv.reader(io.StringIO(response.text)))
+    assert header[:3] == ["patient_id", "amount", "payment_date"]
+    assert [line[1] for line in lines] == ["10.0", "30.0"]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(authorized_client: AsyncClient):
+    response = await authorized_client.get("/insurance/claims/export", params={"format": "xml"})
+    assert response.status_code == 422
@@ -175,4 +175,34 @@ async def test_delete_diagnostic_image(test_client: AsyncClient):
     # Assuming an image with ID 1 exists
     response = await test_client.delete("/lab/diagnostic-images/1")
     assert response.status_code == 200
-    assert response.json() == {"ok": True} 
\ No newline at end of file
+    assert response.json() == {"ok": True} 
+
+@pytest.mark.asyncio
+async def test_list_lab_orders_filters_and_bounds(authorized_client: AsyncClient, test_lab_order_data):
+    orders = [
+        {**test_lab_order_data, "patient_id": 1, "order_date": "2023-01-01"},
+        {**test_lab_order_data, "patient_id": 2, "order_date": "2023-02-01"},
+        {**test_lab_order_data, "patient_id": 2, "order_date": "2023-03-01", "status": "completed"},
+    ]
+    for order in orders:
+        await authorized_client.post("/lab/orders/", json=order)
+
+    response = await authorized_client.get("/lab/orders/", params={"patient_id": 2})
+    assert [o["order_date"] for o in response.json()] == ["2023-02-01", "2023-03-01"]
+
+    response = await authorized_client.get(
+        "/lab/orders/", params={"date_from": "2023-01-15", "date_to": "2023-02-01"}
+    )
+    assert [o["order_date"] for o in response.json()] == ["2023-02-01"]
+
+    response = await authorized_client.get("/lab/orders/", params={"status": "completed"})
+    assert len(response.json()) == 1
+
+    response = await authorized_client.get("/lab/orders/", params={"limit": 100000})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_lab_results_rejects_unsupported_filter(authorized_client: AsyncClient):
+    response = await authorized_client.get("/lab/results/", params={"doctor_id": 1})
+    assert response.status_code == 400
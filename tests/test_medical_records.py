@@ -0,0 +1,126 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from app.api.routes import medical_records
+
+
+@pytest_asyncio.fixture
+async def record_parents(authorized_client: AsyncClient, test_patient_data, test_doctor_data):
+    patient = await authorized_client.post("/patients/", json=test_patient_data)
+    doctor = await authorized_client.post("/doctors/", json=test_doctor_data)
+    return patient.json()["id"], doctor.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_list_fields_narrows_query_and_payload(
+    authorized_client: AsyncClient, record_parents, test_engine
+):
+    patient_id, doctor_id = record_parents
+    for day in (1, 2):
+        response = await authorized_client.post(
+            "/medical-records/",
+            json={
+                "patient_id": patient_id,
+                "doctor_id": doctor_id,
+                "visit_date": f"2024-03-0{day}T09:00:00Z",
+                "diagnosis": "Flu",
+                "notes": "Long clinical notes " * 100,
+            },
+        )
+        assert response.status_code == 200
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await authorized_client.get(
+            "/medical-records/", params={"fields": "visit_date, diagnosis", "limit": 1}
+        )
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"visit_date": "2024-03-01T09:00:00", "diagnosis": "Flu", "id": 1}
+    ]
+    assert "x-next-cursor" in response.headers
+    assert "notes" not in statements[-1]
+
+    response = await authorized_client.get(
+        "/medical-records/",
+        params={"fields": "diagnosis", "after": response.headers["x-next-cursor"]},
+    )
+    assert response.json() == [{"diagnosis": "Flu", "id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_list_fields_rejects_unknown_field(authorized_client: AsyncClient):
+    response = await authorized_client.get("/medical-records/", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: secret"
+
+
+@pytest.mark.asyncio
+async def test_get_medical_record_expand(authorized_client: AsyncClient, record_parents):
+    patient_id, doctor_id = record_parents
+    created = await authorized_client.post(
+        "/medical-records/",
+        json={
+            "patient_id": patient_id,
+            "doctor_id": doctor_id,
+            "visit_date": "2024-03-01T09:00:00Z",
+        },
+    )
+    record_id = created.json()["id"]
+
+    response = await authorized_client.get(f"/medical-records/{record_id}")
+    assert response.status_code == 200
+    assert "patient" not in response.json()
+
+    response = await authorized_client.get(
+        f"/medical-records/{record_id}", params={"expand": "patient"}
+    )
+    assert response.json()["patient"]["id"] == patient_id
+    assert "doctor" not in response.json()
+
+    response = await authorized_client.get(
+        "/medical-records/", params={"expand": "patient,doctor", "patient_id": patient_id}
+    )
+    [item] = response.json()
+    assert (item["patient"]["id"], item["doctor"]["id"]) == (patient_id, doctor_id)
+
+
+@pytest.mark.asyncio
+async def test_create_retries_when_parent_appears_concurrently(
+    authorized_client: AsyncClient, record_parents, monkeypatch
+):
+    patient_id, doctor_id = record_parents
+    create = medical_records.create_with_parents
+    attempts = []
+
+    async def parent_missing_at_first(*args, **kwargs):
+        attempts.append(1)
+        if len(attempts) == 1:
+            return None
+        return await create(*args, **kwargs)
+
+    monkeypatch.setattr(medical_records, "create_with_parents", parent_missing_at_first)
+    payload = {
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+        "visit_date": "2024-03-01T09:00:00Z",
+    }
+    response = await authorized_client.post("/medical-records/", json=payload)
+    assert response.status_code == 200
+    assert len(attempts) == 2
+
+    async def never_inserts(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(medical_records, "create_with_parents", never_inserts)
+    response = await authorized_client.post("/medical-records/", json=payload)
+    assert response.status_code == 409
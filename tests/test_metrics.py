@@ -0,0 +1,54 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import session
+from app.database.session import InstrumentedQueuePool
+
+
+@pytest_asyncio.fixture
+async def pooled_engine(tmp_path):
+    """One-connection pool with one successful checkout and one timed-out attempt."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert engine.pool.checkedout() == 1
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_tracks_checkouts_and_timeouts(pooled_engine):
+    pool = pooled_engine.pool
+    assert pool.checkouts == 1
+    assert pool.timeouts == 1
+    assert pool.wait_seconds >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(test_client: AsyncClient, pooled_engine, monkeypatch):
+    monkeypatch.setattr(session, "_pooled_engines", {"primary": pooled_engine})
+    response = await test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    samples = dict(
+        line.rsplit(" ", 1)
+        for line in response.text.splitlines()
+        if line.startswith("db_pool_")
+    )
+    assert samples['db_pool_size{engine="primary"}'] == "1"
+    assert samples['db_pool_checked_out{engine="primary"}'] == "0"
+    assert samples['db_pool_checkouts_total{engine="primary"}'] == "1"
+    assert samples['db_pool_timeouts_total{engine="primary"}'] == "1"
+    assert float(samples['db_pool_max_wait_seconds{engine="primary"}']) >= 0.05
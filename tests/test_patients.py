@@ -0,0 +1,165 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from app.main import app
+from app.api.dependencies.database import get_async_session, get_read_session
+
+
+def _patient(index: int) -> dict:
+    return {
+        "first_name": f"Patient{index}",
+        "last_name": "Doe",
+        "email": f"patient{index}@example.com",
+        "date_of_birth": "1990-01-01",
+        "gender": "female",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_patient(authorized_client: AsyncClient, test_patient_data):
+    response = await authorized_client.post("/patients/", json=test_patient_data)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == test_patient_data["email"]
+    assert "created_at" in data
+
+
+@pytest.mark.asyncio
+async def test_list_patients_keyset_pagination(authorized_client: AsyncClient):
+    for index in range(5):
+        await authorized_client.post("/patients/", json=_patient(index))
+
+    response = await authorized_client.get("/patients/", params={"limit": 2})
+    assert [p["first_name"] for p in response.json()] == ["Patient0", "Patient1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await authorized_client.get(
+        "/patients/", params={"limit": 2, "after": cursor}
+    )
+    assert [p["first_name"] for p in response.json()] == ["Patient2", "Patient3"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await authorized_client.get(
+        "/patients/", params={"limit": 2, "after": cursor}
+    )
+    assert [p["first_name"] for p in response.json()] == ["Patient4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_list_patients_rejects_invalid_cursor(authorized_client: AsyncClient):
+    response = await authorized_client.get("/patients/", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_session_and_writes_use_primary(
+    authorized_client: AsyncClient, test_session, test_patient_data
+):
+    used = []
+
+    def tracking(name):
+        async def dependency():
+            used.append(name)
+            yield test_session
+
+        return dependency
+
+    app.dependency_overrides[get_async_session] = tracking("primary")
+    app.dependency_overrides[get_read_session] = tracking("replica")
+
+    created = await authorized_client.post("/patients/", json=test_patient_data)
+    assert used == ["primary"]
+
+    await authorized_client.get(f"/patients/{created.json()['id']}")
+    await authorized_client.get("/patients/")
+    assert used == ["primary", "replica", "replica"]
+
+
+@pytest.mark.asyncio
+async def test_writes_do_not_reselect_row(
+    authorized_client: AsyncClient, test_engine, test_patient_data
+):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        created = await authorized_client.post("/patients/", json=test_patient_data)
+        assert created.status_code == 200
+        assert created.json()["created_at"] is not None
+        assert statements == ["INSERT"]
+
+        statements.clear()
+        patient_id = created.json()["id"]
+        updated = await authorized_client.put(
+            f"/patients/{patient_id}", json={"phone": "+1999"}
+        )
+        assert updated.json()["phone"] == "+1999"
+        assert updated.json()["updated_at"] is not None
+        assert statements == ["UPDATE"]
+
+        statements.clear()
+        missing = await authorized_client.put("/patients/9999", json={"phone": "+1"})
+        assert missing.status_code == 404
+        assert statements == ["UPDATE"]
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_patients_reports_per_item(
+    authorized_client: AsyncClient, test_engine
+):
+    await authorized_client.post("/patients/", json=_patient(0))
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement.split()[0], executemany))
+
+    batch = [_patient(1), _patient(0), _patient(2), _patient(1)]
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await authorized_client.post("/patients/bulk", json=batch)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["failed"]) == (2, 2)
+    results = data["results"]
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert results[0]["id"] and results[2]["id"]
+    assert "already exists" in results[1]["error"]
+    assert "repeated" in results[3]["error"]
+    # One lookup for the whole batch, then the valid rows go in as executemany.
+    assert statements[0] == ("SELECT", False)
+    assert set(statements[1:]) == {("INSERT", True)}
+
+    listed = await authorized_client.get("/patients/")
+    assert len(listed.json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_patients_validates_whole_batch(authorized_client: AsyncClient):
+    response = await authorized_client.post(
+        "/patients/bulk", json=[_patient(1), {"first_name": "Missing"}]
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:2] == ["body", 1]
+
+    response = await authorized_client.post("/patients/bulk", json=[])
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_matches_single_read_serialization(authorized_client: AsyncClient):
+    created = (await authorized_client.post("/patients/", json=_patient(1))).json()
+    single = (await authorized_client.get(f"/patients/{created['id']}")).json()
+
+    response = await authorized_client.get("/patients/", params={"limit": 1})
+    assert response.status_code == 200
+    assert response.json() == [single]
+    assert "x-next-cursor" in response.headers